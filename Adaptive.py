@@ -0,0 +1,244 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Adaptive class keeps the latency of a live stream within a target, the lag
+accumulated by its consumer is measured as the wall time elapsed minus the
+media time elapsed since the first frame, above the target frames are
+downscaled then grabbed without being decoded, and restored once the lag
+stays low, every adaptation is recorded as an event
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import time
+from xstream import deque
+from xstream import _Frame
+from xstream import _Stream
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_steps = [(1, 0), (2, 0), (2, 1), (4, 1), (4, 3)] # adaptation levels, (size divider, frames skipped per read frame)
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Adaptive(_Stream):
+    '''
+    Latency adaptive live stream
+    '''
+    def __init__(self, source, latency=0.2, steps=None, hold=1.0, headroom=0.5, callback=None):
+        '''
+        Initializes the stream
+        args:
+            source: represents the opened live stream from which to read frames
+            latency: represents the target lag in seconds of the consumer behind the source (default = 0.2)
+            steps: represents the adaptation levels, from the best one, as (size divider, frames skipped per read frame) (default = None: for [(1, 0), (2, 0), (2, 1), (4, 1), (4, 3)])
+            hold: represents the minimum seconds between adaptations, and the seconds the lag must stay low before stepping up (default = 1.0)
+            headroom: represents the fraction of the target latency below which the lag is low (default = 0.5)
+            callback: represents a callable receiving every adaptation event (default = None)
+        returns:
+            a stream instance
+        '''
+        super().__init__(source)
+        self._type = "Adaptive"
+        self._latency = latency
+        self._steps = list(steps or _steps)
+        self._hold = hold
+        self._headroom = headroom
+        self._callback = callback
+        try:
+            rate = source.get("frame-rate")
+        except RuntimeError:
+            rate = None
+        self._rate = rate or 30     # frame rate estimating the media time of sources without timestamps
+        self._grabbed = 0           # number of grabbed frames, read or skipped
+        self._origin = None         # (wall time, media time) of the first frame, wall time shifted to keep the lag non negative
+        self._changed = None        # wall time of the last adaptation
+        self._low = None            # wall time since when the lag is low
+        self.level = 0              # index of the current adaptation level
+        self.lag = 0.0              # smoothed lag in seconds of the consumer behind the source
+        self.frames = 0             # number of read frames
+        self.skipped = 0            # number of frames grabbed without being decoded
+        self.adaptations = 0        # number of adaptations
+        self.events = deque(maxlen=256) # latest adaptation events
+        self.open()
+    def __len__(self):
+        return self._source.__len__()
+    def open(self, mode="r"):
+        if mode not in ["r"]:
+            raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        self._mode = mode
+        return True
+    def close(self):
+        return True
+    def seek(self, index):
+        return False
+    def read(self):
+        if self._mode not in ["r"]:
+            raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
+        scale, skip = self._steps[self.level]
+        for _ in range(skip):
+            if not self._source.grab():
+                return None
+            self._grabbed += 1
+            self.skipped += 1
+        if not self._source.grab():
+            return None
+        self._grabbed += 1
+        self._measure()
+        frame = self._source.retrieve()
+        if frame is None:
+            return None
+        self.frames += 1
+        self._adapt()
+        if scale > 1:
+            array = cv2.numpy.asarray(frame)
+            array = cv2.resize(array, (array.shape[1] // scale, array.shape[0] // scale), interpolation=cv2.INTER_AREA)
+            if isinstance(frame, _Frame):
+                frame.array = array
+            else:
+                frame = array
+        return frame
+    def write(self):
+        if self._mode not in []:
+            raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
+        return False
+    def stats(self):
+        '''
+        Gets the adaptation metrics
+        returns:
+            dictionary of lag, target latency, level, size divider, skipped frames per read frame, read and skipped frames, and adaptations
+        '''
+        scale, skip = self._steps[self.level]
+        return {
+            "lag": self.lag,
+            "latency": self._latency,
+            "level": self.level,
+            "scale": scale,
+            "skip": skip,
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "adaptations": self.adaptations,
+            }
+    def _measure(self):
+        '''
+        Updates the smoothed lag from the last grabbed frame media time
+        '''
+        now = time.monotonic()
+        try:
+            media = self._source.get(cv2.CAP_PROP_POS_MSEC) or 0
+        except RuntimeError:
+            media = 0
+        # sources without timestamps are assumed to produce frames at their frame rate
+        media = media / 1000 if media > 0 else self._grabbed / self._rate
+        if self._origin is None:
+            self._origin = (now, media)
+            self._changed = now
+        lag = (now - self._origin[0]) - (media - self._origin[1])
+        if lag < 0:
+            # the first frame was already late, the earliest frame is the reference
+            self._origin = (self._origin[0] + lag, self._origin[1])
+            lag = 0.0
+        self.lag += 0.2 * (lag - self.lag)
+    def _adapt(self):
+        '''
+        Steps the adaptation level down while the lag exceeds the target, up while it stays low
+        '''
+        now = time.monotonic()
+        if self.lag > self._latency:
+            self._low = None
+            if self.level + 1 < len(self._steps) and now - self._changed >= self._hold:
+                self._step(+1, now)
+        elif self.lag < self._latency * self._headroom:
+            self._low = self._low if self._low is not None else now
+            if self.level > 0 and now - max(self._low, self._changed) >= self._hold:
+                self._step(-1, now)
+        else:
+            self._low = None
+    def _step(self, direction, now):
+        '''
+        Changes the adaptation level, recording the event
+        '''
+        self.level += direction
+        self._changed = now
+        self.adaptations += 1
+        scale, skip = self._steps[self.level]
+        event = {
+            "timestamp": now,
+            "direction": "down" if direction > 0 else "up",
+            "level": self.level,
+            "scale": scale,
+            "skip": skip,
+            "lag": self.lag,
+            "latency": self._latency,
+            }
+        self.events.append(event)
+        if self._callback is not None:
+            self._callback(event)
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
@@ -69,29 +69,33 @@ class Camera(_Stream):
         self._specifications["frame-channels"] = None
     def __len__(self):
         return cv2.numpy.inf
-    def open(self, mode="r"):
+    def open(self, mode="r", pool=None, format="bgr"):
         if mode not in ["r"]:
             raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
         self._mode = mode
-        self._content = cv2.VideoCapture(int(self._source))
+        self._content = self._acquire(lambda: cv2.VideoCapture(int(self._source)), pool, format=format)
         self._specifications["frame-rate"] = self._content.get(cv2.CAP_PROP_FPS)
         self._specifications["frame-width"] = self._content.get(cv2.CAP_PROP_FRAME_WIDTH)
         self._specifications["frame-height"] = self._content.get(cv2.CAP_PROP_FRAME_HEIGHT)
         self._specifications["frame-channels"] = self._content.get(cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS)
+        # YUYV cameras frames are converted once from their raw frames, skipping the BGR conversion
+        raw = format in ["rgb", "gray"] and int(self._content.get(cv2.CAP_PROP_FOURCC)) == cv2.VideoWriter_fourcc(*"YUYV")
+        raw = raw and self._content.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        self._negotiate(format, raw=raw)
         return self._content.isOpened()
     def close(self):
-        self._content.release()
-        self._content = None
+        self._release()
         return True
     def seek(self, index):
         return False
     def read(self):
         if self._mode not in ["r"]:
             raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
-        status, frame = self._content.read()
-        if not status:
-            frame = None
-        return frame
+        return self._retrieve()
+    def get(self, property):
+        if property in self._specifications:
+            return self._specifications[property]
+        return self._content.get(property)
     def write(self):
         if self._mode not in []:
             raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
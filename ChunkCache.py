@@ -0,0 +1,197 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+ChunkCache class stores fixed-size chunks of remote files on disk, addressed
+by the remote content identity, evicting the least recently used chunks once
+the cache exceeds its size limit
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import os
+from xstream import tempfile
+from xstream import Path
+from xstream import Lock
+from xstream import hashlib
+from xstream import OrderedDict
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class ChunkCache:
+    '''
+    On-disk least recently used chunks cache
+    '''
+    _shared = None
+    def __init__(self, root=None, limit=1<<30, chunk=1<<20):
+        '''
+        Initializes the cache, indexing the chunks already on disk
+        args:
+            root: represents the directory to store chunks into (default = None: for `~/.cache/xstream/chunks`)
+            limit: represents the maximum total size in bytes of stored chunks (default = 1 GiB)
+            chunk: represents the size in bytes of a chunk (default = 1 MiB)
+        returns:
+            a cache instance
+        '''
+        self._root = Path(root) if root is not None else Path.home() / ".cache" / "xstream" / "chunks"
+        self._limit = limit
+        self._chunk = chunk
+        self._lock = Lock()
+        self._entries = OrderedDict()   # stored chunks, path -> size, least recently used first
+        self._size = 0                  # total size in bytes of stored chunks
+        self._root.mkdir(parents=True, exist_ok=True)
+        stored = [(path, path.stat()) for path in self._root.glob("*/*") if path.suffix != ".tmp"]
+        for path, status in sorted(stored, key=lambda entry: entry[1].st_mtime):
+            self._entries[path] = status.st_size
+            self._size += status.st_size
+    @classmethod
+    def shared(cls):
+        '''
+        Gets the cache shared among all streams
+        returns:
+            the shared cache instance
+        '''
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    @classmethod
+    def share(cls, cache):
+        '''
+        Sets the cache shared among all streams
+        args:
+            cache: represents the cache instance to be shared
+        returns:
+            the shared cache instance
+        '''
+        cls._shared = cache
+        return cls._shared
+    @property
+    def chunk(self):
+        '''
+        Gets the size in bytes of a chunk
+        '''
+        return self._chunk
+    @property
+    def size(self):
+        '''
+        Gets the total size in bytes of stored chunks
+        '''
+        return self._size
+    def get(self, identity, index):
+        '''
+        Gets a stored chunk
+        args:
+            identity: represents the remote content identity, ex: url with its validators
+            index: represents the chunk index within the remote content
+        returns:
+            chunk bytes if stored, None otherwise
+        '''
+        path = self._path(identity, index)
+        with self._lock:
+            if path not in self._entries:
+                return None
+            self._entries.move_to_end(path)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._size -= self._entries.pop(path, 0)
+            return None
+        return data
+    def put(self, identity, index, data):
+        '''
+        Stores a chunk, evicting least recently used chunks to fit the size limit
+        args:
+            identity: represents the remote content identity, ex: url with its validators
+            index: represents the chunk index within the remote content
+            data: represents the chunk bytes
+        '''
+        path = self._path(identity, index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written aside under a unique name, as threads may store the same chunk at once
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temporary, path)
+        with self._lock:
+            self._size += len(data) - self._entries.pop(path, 0)
+            self._entries[path] = len(data)
+            while self._size > self._limit and len(self._entries) > 1:
+                evicted, size = self._entries.popitem(last=False)
+                self._size -= size
+                evicted.unlink(missing_ok=True)
+    def _path(self, identity, index):
+        '''
+        Gets the content-addressed path of a chunk
+        '''
+        digest = hashlib.sha256(f"{identity}#{self._chunk}#{index}".encode()).hexdigest()
+        return self._root / digest[:2] / digest
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
@@ -0,0 +1,308 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Dataset class samples fixed length clips from many videos for training, each
+process keeps warm capture handles and seeks to the nearest key frame only when
+decoding forward is costlier, clips are decoded into preallocated arrays, in
+batches shared with worker processes through shared memory
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import os
+from xstream import cv2
+from xstream import time
+from xstream import random
+from xstream import Path
+from xstream import bisect_right
+from xstream import ProcessPoolExecutor
+from xstream import shared_memory
+from xstream import _Pool
+from xstream import _Probe
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_dataset = None     # dataset copy of a worker process
+_memories = dict()  # shared memory attached by a worker process, name -> memory
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+def _initialize(dataset):
+    '''
+    Initializes a worker process with its own dataset copy, so capture handles stay warm across clips
+    '''
+    global _dataset
+    _dataset = dataset
+
+def _decode(index, name, shape, offset):
+    '''
+    Decodes a clip of the worker process dataset into a shared memory batch
+    args:
+        index: represents the clip index
+        name: represents the shared memory name
+        shape: represents the clip shape (T, H, W, C)
+        offset: represents the clip offset within the shared memory
+    returns:
+        the clip index
+    '''
+    memory = _memories.get(name)
+    if memory is None:
+        # the batches are owned by the sampling process, workers MUST NOT remove them on exit
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # python < 3.13 always tracks attached shared memory, within the sampling process tracker shared by its workers
+            memory = shared_memory.SharedMemory(name=name)
+        _memories[name] = memory
+    _dataset._decode(index, cv2.numpy.ndarray(shape, cv2.numpy.uint8, buffer=memory.buf, offset=offset))
+    return index
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Dataset:
+    '''
+    Random access video clips dataset, usable as a map-style `torch.utils.data.Dataset`
+    '''
+    def __init__(self, sources, length=16, stride=1, step=None, size=None, handles=8):
+        '''
+        Initializes the dataset, probing all videos specifications and key frames
+        args:
+            sources: represents the videos paths
+            length: represents the number of frames of a clip (default = 16)
+            stride: represents the index increment between two consecutive frames of a clip (default = 1)
+            step: represents the index increment between two consecutive clips of a video (default = None: for non overlapping clips)
+            size: represents the clips frame size (width, height), other sizes are resized (default = None: for first video frame size)
+            handles: represents the maximum number of warm capture handles kept per process (default = 8)
+        returns:
+            a dataset instance
+        '''
+        self._sources = [str(Path(source)) for source in sources]
+        self._length = length
+        self._stride = stride
+        self._step = step or length * stride
+        self._handles = handles
+        self._specifications = _Probe.shared().probe_many(self._sources, keyframes=True)
+        span = (length - 1) * stride + 1
+        self._offsets = [0] # index of first clip of each video, then total number of clips
+        for specifications in self._specifications:
+            count = max(0, (specifications["frame-count"] - span) // self._step + 1) if specifications else 0
+            self._offsets.append(self._offsets[-1] + count)
+        if size is None:
+            specifications = next((specifications for specifications in self._specifications if specifications), None)
+            if specifications is None:
+                raise RuntimeError(f"Not supported {self.__class__.__name__} sources `{self._sources[:4]}...`, none could be probed")
+            size = (specifications["frame-width"], specifications["frame-height"])
+        self._size = tuple(size)
+        self._shape = (length, self._size[1], self._size[0], 3)
+        self._pool = None   # warm capture handles of the current process
+        self._pid = None    # process owning the warm capture handles
+        self.samples = 0    # number of decoded clips
+        self.elapsed = 0.0  # seconds spent decoding clips
+    def __len__(self):
+        return self._offsets[-1]
+    def __getitem__(self, index):
+        '''
+        Decodes a clip
+        args:
+            index: represents the clip index
+        returns:
+            clip frames array of shape (T, H, W, C)
+        '''
+        clip = cv2.numpy.empty(self._shape, cv2.numpy.uint8)
+        self._decode(index, clip)
+        return clip
+    def __getstate__(self):
+        # capture handles are never shared among processes
+        state = dict(self.__dict__)
+        state["_pool"] = None
+        state["_pid"] = None
+        return state
+    @property
+    def shape(self):
+        '''
+        Gets the clips shape (T, H, W, C)
+        '''
+        return self._shape
+    @property
+    def rate(self):
+        '''
+        Gets the number of decoded clips per second
+        '''
+        return self.samples / self.elapsed if self.elapsed > 0 else 0.0
+    def clip(self, index):
+        '''
+        Gets the video and frames of a clip
+        args:
+            index: represents the clip index
+        returns:
+            (video path, index of first frame, index increment between frames)
+        '''
+        video, first = self._locate(index)
+        return self._sources[video], first, self._stride
+    def batches(self, batch=8, workers=0, shuffle=True, seed=None, prefetch=2, copy=False):
+        '''
+        Decodes all clips in batches, through worker processes if any
+        args:
+            batch: represents the number of clips per batch (default = 8)
+            workers: represents the number of decoding processes (default = 0: for the current process)
+            shuffle: represents whether to sample clips in random order (default = True)
+            seed: represents the shuffling random seed (default = None)
+            prefetch: represents the number of batches decoded ahead by worker processes (default = 2)
+            copy: represents whether to copy batches, otherwise a batch is overwritten `prefetch` batches later (default = False)
+        returns:
+            generator of (clips indices, clips array of shape (B, T, H, W, C))
+        '''
+        indices = list(range(len(self)))
+        if shuffle:
+            random.Random(seed).shuffle(indices)
+        groups = [indices[start:start + batch] for start in range(0, len(indices), batch)]
+        if workers <= 0:
+            clips = cv2.numpy.empty((batch, *self._shape), cv2.numpy.uint8)
+            for group in groups:
+                for slot, index in enumerate(group):
+                    self._decode(index, clips[slot])
+                yield group, clips[:len(group)].copy() if copy else clips[:len(group)]
+            return
+        prefetch = max(1, prefetch)
+        size = int(cv2.numpy.prod(self._shape))
+        memory = shared_memory.SharedMemory(create=True, size=prefetch * batch * size)
+        clips = cv2.numpy.ndarray((prefetch, batch, *self._shape), cv2.numpy.uint8, buffer=memory.buf)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_initialize, initargs=(self,))
+        def submit(number):
+            slot = number % prefetch
+            return [executor.submit(_decode, index, memory.name, self._shape, (slot * batch + position) * size) for position, index in enumerate(groups[number])]
+        view = None
+        try:
+            start = time.perf_counter()
+            pending = [submit(number) for number in range(min(prefetch, len(groups)))]
+            for number, group in enumerate(groups):
+                for future in pending.pop(0):
+                    future.result()
+                self.samples += len(group)
+                self.elapsed = time.perf_counter() - start
+                view = clips[number % prefetch, :len(group)]
+                yield group, view.copy() if copy else view
+                # the batch slot is reused once consumed
+                if number + prefetch < len(groups):
+                    pending.append(submit(number + prefetch))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            del view, clips
+            memory.close()
+            memory.unlink()
+    def _locate(self, index):
+        '''
+        Gets the video index and the index of first frame of a clip
+        '''
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Not supported {self.__class__.__name__} clip index `{index}` for `{len(self)}` clips")
+        video = bisect_right(self._offsets, index) - 1
+        return video, (index - self._offsets[video]) * self._step
+    def _decode(self, index, clip):
+        '''
+        Decodes a clip into a preallocated array
+        args:
+            index: represents the clip index
+            clip: represents the array of shape (T, H, W, C) to decode into
+        '''
+        start = time.perf_counter()
+        video, first = self._locate(index)
+        source, stride = self._sources[video], self._stride
+        if self._pid != os.getpid():
+            self._pool = _Pool(size=self._handles, idle=float("inf"))
+            self._pid = os.getpid()
+        capture = self._pool.acquire(source, lambda: cv2.VideoCapture(source))
+        try:
+            keyframes = self._specifications[video].get("key-frames")
+            position = int(capture.get(cv2.CAP_PROP_POS_FRAMES))
+            keyframe = keyframes[max(0, bisect_right(keyframes, first) - 1)] if keyframes else first
+            if not keyframe <= position <= first:
+                # decoding forward from the current position is costlier than from the nearest key frame
+                capture.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+                position = keyframe
+            for _ in range(first - position):
+                capture.grab()
+            resize = (int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))) != self._size
+            for frame in range(len(clip)):
+                for _ in range(stride - 1 if frame > 0 else 0):
+                    capture.grab()
+                if resize:
+                    status, image = capture.read()
+                    if status:
+                        cv2.resize(image, self._size, dst=clip[frame])
+                else:
+                    status, _ = capture.read(clip[frame])
+                if not status:
+                    clip[frame:] = 0 # announced frame count exceeds decodable frames
+                    break
+        finally:
+            self._pool.release(source, capture)
+        self.samples += 1
+        self.elapsed += time.perf_counter() - start
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
@@ -0,0 +1,229 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+FFmpeg class encodes raw frames through a pipe to a local `ffmpeg` process, it
+mimics the `cv2.VideoWriter` writing interface so it can be used as a stream
+content descriptor
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import time
+from xstream import shutil
+from xstream import subprocess
+from xstream import Path
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_pixel_formats = {1: "gray", 3: "bgr24", 4: "bgra"} # raw pixel format by number of frame channels
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class FFmpeg:
+    '''
+    FFmpeg pipe video writer
+    '''
+    def __init__(self, filename, fps=None, codec="libx264", preset="veryfast", crf=23, threads=0, executable="ffmpeg"):
+        '''
+        Initializes the writer, the encoder process is started on the first written frame to learn the frame size
+        args:
+            filename: represents the output video file path
+            fps: represents the output frame rate (default = None: for 30)
+            codec: represents the ffmpeg video encoder (default = 'libx264')
+            preset: represents the encoder speed/compression preset (default = 'veryfast')
+            crf: represents the encoder constant rate factor quality, lower is better (default = 23)
+            threads: represents the number of encoder threads (default = 0: for ffmpeg choice)
+            executable: represents the ffmpeg executable name or path (default = 'ffmpeg')
+        returns:
+            a writer instance, check `isOpened` for the executable availability
+        '''
+        self._filename = Path(filename)
+        self._fps = fps or 30
+        self._codec = codec
+        self._preset = preset
+        self._crf = crf
+        self._threads = threads
+        self._executable = shutil.which(executable)
+        self._process = None
+        self._shape = None
+        self._error = None  # encoder failure, later frames are refused as the output is partial
+        self.frames = 0     # number of written frames
+        self.piped = 0      # number of raw bytes piped to the encoder
+        self.elapsed = 0.0  # seconds spent piping frames, including encoder back-pressure
+    def isOpened(self):
+        '''
+        Gets the writer status
+        returns:
+            True if frames can be written, False otherwise
+        '''
+        return self._executable is not None and self._error is None and (self._process is None or self._process.poll() is None)
+    def write(self, frame):
+        '''
+        Writes a frame, piping its buffer without copying if contiguous
+        args:
+            frame: represents the frame to be written, all frames MUST share the first frame size
+        '''
+        if self._error is not None:
+            raise RuntimeWarning(f"Couldn't complete operation `write` for video `{self._filename}`: {self._error}")
+        if self._process is None:
+            self._start(frame)
+        if frame.shape != self._shape:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} operation `write` for frame `{frame.shape}` into video `{self._filename}` of `{self._shape}`")
+        start = time.perf_counter()
+        view = memoryview(cv2.numpy.ascontiguousarray(frame)).cast("B")
+        written = 0
+        try:
+            while written < len(view):
+                written += self._process.stdin.write(view[written:])
+        except BrokenPipeError:
+            # encoder exited early, ex: unknown codec, disk full
+            self._error = self._abort() or "encoder exited"
+            raise RuntimeWarning(f"Couldn't complete operation `write` for video `{self._filename}`: {self._error}")
+        finally:
+            view.release()
+        self.elapsed += time.perf_counter() - start
+        self.piped += written
+        self.frames += 1
+    def write_many(self, frames):
+        '''
+        Writes many frames in order
+        args:
+            frames: represents an iterable of frames
+        returns:
+            number of written frames
+        '''
+        count = 0
+        for frame in frames:
+            self.write(frame)
+            count += 1
+        return count
+    def get(self, property):
+        '''
+        Gets specified writing statistic
+        args:
+            property: represents one of 'frames-written', 'bytes-piped', 'bytes-written', 'write-rate' (frames per second)
+        returns:
+            statistic value, None if not available
+        '''
+        if property == "frames-written":
+            return self.frames
+        if property == "bytes-piped":
+            return self.piped
+        if property == "bytes-written":
+            return self._filename.stat().st_size if self._filename.exists() else 0
+        if property == "write-rate":
+            return self.frames / self.elapsed if self.elapsed > 0 else None
+        return None
+    def release(self):
+        '''
+        Closes the pipe and waits for the encoder to finalize the output video
+        '''
+        if self._process is None:
+            return
+        start = time.perf_counter()
+        self._process.stdin.close()
+        status = self._process.wait()
+        self.elapsed += time.perf_counter() - start
+        error = self._process.stderr.read().decode(errors="replace").strip()
+        self._process.stderr.close()
+        self._process = None
+        if status != 0:
+            raise RuntimeWarning(f"Couldn't complete operation `write` for video `{self._filename}`: {error}")
+    def _abort(self):
+        '''
+        Reaps the exited encoder process
+        returns:
+            the encoder error output
+        '''
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass # unflushed bytes are lost with the pipe
+        self._process.wait()
+        error = self._process.stderr.read().decode(errors="replace").strip()
+        self._process.stderr.close()
+        self._process = None
+        return error
+    def _start(self, frame):
+        '''
+        Starts the encoder process for the frame size
+        '''
+        channels = frame.shape[2] if len(frame.shape) > 2 else 1
+        if frame.dtype != cv2.numpy.uint8 or channels not in _pixel_formats:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} operation `write` for frame `{frame.shape}` `{frame.dtype}` into video `{self._filename}`")
+        self._shape = frame.shape
+        command = [
+            self._executable, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", _pixel_formats[channels], "-s", f"{frame.shape[1]}x{frame.shape[0]}", "-r", str(self._fps), "-i", "-",
+            "-c:v", self._codec, "-preset", str(self._preset), "-crf", str(self._crf), "-threads", str(self._threads),
+            "-pix_fmt", "yuv420p", str(self._filename),
+            ]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, bufsize=0)
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
@@ -0,0 +1,131 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Frame class is a compact record wrapping the pixels array of a read frame,
+without copying it, with its index, presentation time, monotonic capture time
+and source, it behaves like the wrapped array for numpy and attribute access
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import time
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Frame:
+    '''
+    Frame record
+    '''
+    __slots__ = ("array", "index", "pts", "timestamp", "source")
+    def __init__(self, array, index=None, pts=None, timestamp=None, source=None):
+        '''
+        Initializes the record
+        args:
+            array: represents the frame pixels array, wrapped without copying
+            index: represents the frame index within its stream (default = None)
+            pts: represents the frame presentation time in seconds within its stream (default = None)
+            timestamp: represents the frame monotonic capture time, `time.monotonic` clock (default = None)
+            source: represents the frame stream source (default = None)
+        returns:
+            a record instance
+        '''
+        self.array = array
+        self.index = index
+        self.pts = pts
+        self.timestamp = timestamp
+        self.source = source
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and dtype != self.array.dtype:
+            return self.array.astype(dtype)
+        return self.array.copy() if copy else self.array
+    def __getattr__(self, name):
+        # only reached for attributes other than the record ones, ex: shape, dtype
+        if name in Frame.__slots__:
+            raise AttributeError(name)
+        return getattr(self.array, name)
+    def __getitem__(self, key):
+        return self.array[key]
+    def __len__(self):
+        return len(self.array)
+    def __repr__(self):
+        return f"{self.__class__.__name__}(shape={self.array.shape}, index={self.index}, pts={self.pts}, timestamp={self.timestamp}, source={self.source})"
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in Frame.__slots__}
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+    @property
+    def age(self):
+        '''
+        Gets the seconds elapsed since the frame capture
+        '''
+        return time.monotonic() - self.timestamp if self.timestamp is not None else None
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
@@ -0,0 +1,245 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Governor class accounts the frame memory held by streams buffers, queues and
+caches per source, within a process wide budget and per source quotas, telling
+producers to block, drop their oldest frames or downscale once exceeded
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import time
+from xstream import Condition
+from xstream import _Frame
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Governor:
+    '''
+    Process wide frame memory governor
+    '''
+    _shared = None
+    def __init__(self, budget=None, quota=None, policy="block"):
+        '''
+        Initializes the governor
+        args:
+            budget: represents the maximum number of bytes held by all sources (default = None: for no limit)
+            quota: represents the default maximum number of bytes held by a source (default = None: for no limit)
+            policy: represents the default policy of a source exceeding its limits (default = 'block': for producer waiting, 'drop': for oldest frames dropped, 'downscale': for frames downscaled)
+        returns:
+            a governor instance
+        '''
+        if policy not in ["block", "drop", "downscale"]:
+            raise ValueError(f"Not supported {self.__class__.__name__} policy `{policy}`")
+        self._budget = budget
+        self._quota = quota
+        self._policy = policy
+        self._condition = Condition()
+        self._sources = dict()  # registered sources, source -> (quota, policy)
+        self._usage = dict()    # held bytes, source -> bytes
+        self._total = 0
+        self.peak = 0           # maximum number of bytes held by all sources at once
+    @classmethod
+    def shared(cls):
+        '''
+        Gets the governor shared among all streams
+        returns:
+            the shared governor instance
+        '''
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    @classmethod
+    def share(cls, governor):
+        '''
+        Sets the governor shared among all streams
+        args:
+            governor: represents the governor instance to be shared
+        returns:
+            the shared governor instance
+        '''
+        cls._shared = governor
+        return cls._shared
+    @property
+    def total(self):
+        '''
+        Gets the number of bytes held by all sources
+        '''
+        return self._total
+    def register(self, source, quota=None, policy=None):
+        '''
+        Sets the limits of a source
+        args:
+            source: represents the stream source
+            quota: represents the maximum number of bytes held by the source (default = None: for the default quota)
+            policy: represents the policy of the source exceeding its limits (default = None: for the default policy)
+        '''
+        if policy is not None and policy not in ["block", "drop", "downscale"]:
+            raise ValueError(f"Not supported {self.__class__.__name__} policy `{policy}` for source `{source}`")
+        with self._condition:
+            self._sources[str(source)] = (quota, policy)
+            self._condition.notify_all()
+    def policy(self, source):
+        '''
+        Gets the policy of a source exceeding its limits
+        '''
+        policy = self._sources.get(str(source), (None, None))[1]
+        return policy if policy is not None else self._policy
+    def usage(self, source=None):
+        '''
+        Gets the held bytes
+        args:
+            source: represents the stream source (default = None: for all sources)
+        returns:
+            number of bytes held by the source, or dictionary of bytes held per source
+        '''
+        with self._condition:
+            if source is not None:
+                return self._usage.get(str(source), 0)
+            return {source: usage for source, usage in self._usage.items() if usage > 0}
+    def over(self, source):
+        '''
+        Gets whether the limits are reached by a source or by all sources
+        '''
+        with self._condition:
+            return not self._fits(str(source), 1)
+    def charge(self, source, size, timeout=0, force=False):
+        '''
+        Accounts bytes held by a source, a source holding nothing is always accounted so it can progress
+        args:
+            source: represents the stream source
+            size: represents the number of bytes
+            timeout: represents the maximum seconds to wait for the bytes to fit (default = 0: for no waiting, None: for waiting forever)
+            force: represents whether to account the bytes even if exceeding the limits (default = False)
+        returns:
+            True if accounted, False otherwise
+        '''
+        source = str(source)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            while not force and not self._fits(source, size):
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self._usage[source] = self._usage.get(source, 0) + size
+            self._total += size
+            self.peak = max(self.peak, self._total)
+            return True
+    def admit(self, source, frame, timeout=None):
+        '''
+        Accounts a frame held by a source as per the source policy, 'block': waiting for memory, 'downscale': halving the frame up to an eighth then waiting, 'drop': never waiting
+        args:
+            source: represents the stream source
+            frame: represents the frame, or `Frame` record, to be held
+            timeout: represents the maximum seconds to wait for memory (default = None: for waiting forever)
+        returns:
+            (the frame to be held, possibly downscaled, whether it is accounted), unaccounted frames are not to be held, or make room by dropping the oldest held ones
+        '''
+        policy = self.policy(source)
+        if policy in ["downscale"]:
+            for _ in range(3):
+                if self.charge(source, frame.nbytes):
+                    return frame, True
+                array = cv2.numpy.asarray(frame)
+                array = cv2.resize(array, (max(1, array.shape[1] // 2), max(1, array.shape[0] // 2)), interpolation=cv2.INTER_AREA)
+                if isinstance(frame, _Frame):
+                    frame.array = array # records keep their metadata
+                else:
+                    frame = array
+        if policy in ["drop"]:
+            return frame, self.charge(source, frame.nbytes)
+        return frame, self.charge(source, frame.nbytes, timeout=timeout)
+    def release(self, source, size):
+        '''
+        Accounts bytes no longer held by a source, waking the producers waiting for memory
+        '''
+        source = str(source)
+        with self._condition:
+            usage = self._usage.get(source, 0)
+            released = min(usage, size) # bytes released more than once are not accounted twice
+            self._usage[source] = usage - released
+            self._total = max(0, self._total - released)
+            self._condition.notify_all()
+    def _fits(self, source, size):
+        '''
+        Gets whether bytes fit within the limits of a source, caller MUST hold the condition
+        '''
+        usage = self._usage.get(source, 0)
+        if usage == 0 and size > 0:
+            return True
+        quota = self._sources.get(source, (None, None))[0]
+        quota = quota if quota is not None else self._quota
+        if quota is not None and usage + size > quota:
+            return False
+        return self._budget is None or self._total + size <= self._budget
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
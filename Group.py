@@ -0,0 +1,163 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Group class reads synchronized framesets from many streams, ex: stereo or multi
+view camera rigs, grabbing all streams back to back then decoding the grabbed
+frames in parallel, measuring the skew between streams capture timestamps
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import time
+from xstream import ThreadPoolExecutor
+from xstream import _Stream
+from xstream import XStream
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Group:
+    '''
+    Synchronized streams group
+    '''
+    def __init__(self, sources, max_skew=None, workers=None, **options):
+        '''
+        Initializes the group, opening the sources not already opened
+        args:
+            sources: represents the streams, or their sources, ex: cameras indices, rtsp links, videos paths
+            max_skew: represents the maximum seconds between first and last grab of a frameset, others are dropped (default = None: for no limit)
+            workers: represents the number of parallel decoding threads (default = None: for one per stream)
+            options: represents the open parameters of the sources not already opened, ex: pool, format
+        returns:
+            a group instance
+        '''
+        self._streams = []
+        self._owned = []    # streams opened, thus closed, by the group
+        for source in sources:
+            if not isinstance(source, (XStream, _Stream)):
+                source = XStream(source)
+                if not source.open("r", **options):
+                    self.close()
+                    raise RuntimeError(f"Couldn't complete {self.__class__.__name__} operation `open` for stream source `{source}`")
+                self._owned.append(source)
+            self._streams.append(source)
+        self._max_skew = max_skew
+        self._executor = ThreadPoolExecutor(max_workers=workers or len(self._streams))
+        self.timestamps = None  # monotonic grab timestamps of the last frameset
+        self.skew = None        # seconds between first and last grab of the last frameset
+        self.framesets = 0      # number of read framesets
+        self.dropped = 0        # number of framesets dropped for exceeding the maximum skew
+    def __len__(self):
+        return min(len(stream) for stream in self._streams)
+    def __iter__(self):
+        return self
+    def __next__(self):
+        frameset = self.read()
+        if frameset is None:
+            raise StopIteration()
+        return frameset
+    def read(self):
+        '''
+        Reads the next synchronized frameset
+        returns:
+            (frames tuple, timestamps tuple, skew) on success, None otherwise
+        '''
+        while True:
+            # grabbing is kept back to back, decoding is deferred so it does not delay the other streams
+            timestamps = []
+            for stream in self._streams:
+                if not stream.grab():
+                    return None
+                timestamps.append(time.monotonic())
+            skew = timestamps[-1] - timestamps[0]
+            if self._max_skew is None or skew <= self._max_skew:
+                break
+            self.dropped += 1
+        frames = tuple(self._executor.map(lambda stream: stream.retrieve(), self._streams))
+        if any(frame is None for frame in frames):
+            return None
+        self.timestamps = tuple(timestamps)
+        self.skew = skew
+        self.framesets += 1
+        return frames, self.timestamps, skew
+    def close(self):
+        '''
+        Closes the streams opened by the group
+        returns:
+            True on a successful closing, False otherwise
+        '''
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for stream in self._owned:
+            stream.close()
+        self._owned = []
+        return True
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
@@ -31,7 +31,12 @@ Copyright 2024 BaSSeM
 ## #############################################################################
 
 from xstream import cv2
-from xstream import pafy
+from xstream import Path
+from xstream import urlsplit
+from xstream import _Resolver
+from xstream import _Probe
+from xstream import _RangeReader
+from xstream import _MJPEG
 from xstream import _Stream
 
 ## #############################################################################
@@ -68,31 +73,86 @@ class HTTP(_Stream):
         self._specifications["frame-width"] = None
         self._specifications["frame-height"] = None
         self._specifications["frame-channels"] = None
+        self._reader = None
     def __len__(self):
+        if isinstance(self._content, _MJPEG):
+            return cv2.numpy.inf # live multipart JPEG streams have no end
         return int(self._content.get(cv2.CAP_PROP_FRAME_COUNT))
-    def open(self, mode="r"):
+    def open(self, mode="r", resolver=None, mjpeg=None, latest=False, workers=0, ranges=None, cache=None, pool=None, format="bgr", scale=1, buffers=0):
         if mode not in ["r"]:
             raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
         self._mode = mode
-        self._content = cv2.VideoCapture(pafy.new(str(self._source)).getbest(preftype="mp4").url)
+        self._content = None
+        probe = None
+        if mjpeg is None and Path(urlsplit(str(self._source)).path).suffix[1:].lower() in ["mp4", "avi"]:
+            mjpeg = False # remote files are not probed for multipart JPEG streams
+        if mjpeg is not False:
+            # multipart JPEG streams are parsed natively, bypassing FFmpeg probing and buffering
+            self._content = _MJPEG(str(self._source), latest=latest, workers=workers, scale=scale, buffers=buffers)
+            if not self._content.isOpened() and mjpeg is None:
+                probe = self._content.sniffed # the probing response is reused by the remote file reader
+                self._content = None
+        if self._content is None:
+            resolver = resolver if resolver is not None else _Resolver.shared()
+            url = resolver.resolve(self._source)
+            probe = probe if url == str(self._source) else None
+            self._content = self._acquire(lambda: self._capture(url, ranges, cache, probe), pool, ranges=ranges)
+            if not self._content.isOpened():
+                # cached media link may be refused before its announced expiry, resolve it once again
+                resolver.invalidate(self._source)
+                self._content = self._acquire(lambda: self._capture(resolver.resolve(self._source), ranges, cache), pool, ranges=ranges)
         self._specifications["frame-rate"] = self._content.get(cv2.CAP_PROP_FPS)
         self._specifications["frame-width"] = self._content.get(cv2.CAP_PROP_FRAME_WIDTH)
         self._specifications["frame-height"] = self._content.get(cv2.CAP_PROP_FRAME_HEIGHT)
         self._specifications["frame-channels"] = self._content.get(cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS)
+        self._negotiate(format)
         return self._content.isOpened()
     def close(self):
-        self._content.release()
-        self._content = None
+        # captures reading through a range reader are not kept warm
+        self._release(pooled=self._reader is None)
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
         return True
+    def tell(self):
+        if self._reader is None:
+            return super().tell()
+        return int(self._content.get(cv2.CAP_PROP_POS_FRAMES))
     def seek(self, index):
-        return False
+        if self._reader is None:
+            return False
+        return self._content.set(cv2.CAP_PROP_POS_FRAMES, index)
     def read(self):
         if self._mode not in ["r"]:
             raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
-        status, frame = self._content.read()
-        if not status:
-            frame = None
-        return frame
+        return self._retrieve()
+    def keyframes(self, resolver=None, cache=None):
+        # only the chunks holding key frames are fetched, by seeking to each of them
+        resolver = resolver if resolver is not None else _Resolver.shared()
+        reader = _RangeReader(resolver.resolve(self._source), cache=cache)
+        if not reader.seekable() or not hasattr(cv2, "IStreamReader"):
+            reader.close()
+            raise RuntimeError(f"Not supported operation `keyframes` for non seekable stream source `{self._source}`")
+        specifications = _Probe.shared().probe_file(reader, keyframes=True)
+        reader.seek(0)
+        capture = cv2.VideoCapture(reader, cv2.CAP_FFMPEG, [])
+        try:
+            yield from self._scan(capture, specifications)
+        finally:
+            capture.release()
+            reader.close()
+    def _capture(self, url, ranges=None, cache=None, probe=None):
+        self._reader = None
+        if ranges is not False and hasattr(cv2, "IStreamReader"):
+            # remote files are read through Range requests and cached chunks to be seekable
+            reader = _RangeReader(url, cache=cache, probe=probe)
+            if reader.seekable():
+                capture = cv2.VideoCapture(reader, cv2.CAP_FFMPEG, [])
+                if capture.isOpened():
+                    self._reader = reader
+                    return capture
+            reader.close()
+        return cv2.VideoCapture(url)
     def write(self):
         if self._mode not in []:
             raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
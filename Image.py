@@ -32,6 +32,8 @@ Copyright 2024 BaSSeM
 
 from xstream import cv2
 from xstream import Path
+from xstream import _Governor
+from xstream import _JPEG
 from xstream import _Stream
 
 ## #############################################################################
@@ -70,30 +72,75 @@ class Image(_Stream):
         self._specifications["frame-width"] = None
         self._specifications["frame-height"] = None
         self._specifications["frame-channels"] = None
+        self._position = 0      # index of next frame to be read
+        self._repeat = False    # whether reading keeps returning the frame instead of ending after it
+        self._modified = None   # modification time of the decoded frame source
     def __len__(self):
-        return int(self._content.get(cv2.CAP_PROP_FRAME_COUNT))
-    def open(self, mode="r"):
+        return 1
+    def open(self, mode="r", repeat=False, governor=None, scale=1, backend=None):
         if mode not in ["r", "w"]:
             raise ValueError(f"Not supported {self.__class__.__name__} operation `open` for mode `{mode}` for stream source `{self._source}`")
         self._mode = mode
+        self._repeat = repeat
+        self._position = 0
+        self._governor = governor if governor is not None else _Governor.shared()
+        if Path(self._source).suffix[1:].lower() not in ["jpg", "jpeg", "jpe"]:
+            backend = "opencv" # other formats are decoded by OpenCV, then reduced
+        self._decoder = _JPEG(scale, backend)
         status = Path(self._source).exists()
         if self._mode in ["w"]:
             status = True
         return status
     def close(self):
-        # Nothing to be done
+        self._uncache()
+        self._content = None
+        self._modified = None
         return True
+    def tell(self):
+        return self._position
     def seek(self, index):
-        return False
+        if index not in [0]:
+            return False
+        self._position = index
+        return True
     def read(self):
         if self._mode not in ["r"]:
             raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
-        self._content = cv2.imread(str(self._source))
-        if self._content is not None:
-            self._specifications["frame-width"] = self._content.shape[1]
-            self._specifications["frame-height"] = self._content.shape[0]
-            self._specifications["frame-channels"] = self._content.shape[2] if len(self._content.shape) > 2 else 1
-        return self._content
+        if self._position >= len(self) and not self._repeat:
+            return None
+        try:
+            modified = Path(self._source).stat().st_mtime_ns
+        except OSError:
+            modified = None
+        frame = self._content
+        if frame is None or modified != self._modified:
+            # decoded once, then only decoded again if the source is modified
+            self._uncache()
+            frame = self._decoder.read(self._source)
+            charged = False
+            if frame is not None:
+                # kept decoded only within the governed memory, caching never waits for it
+                frame, charged = self._governor.admit(self._source, frame, timeout=0)
+            if charged:
+                self._content = frame
+                self._modified = modified
+        if frame is not None:
+            if frame is self._content:
+                frame = frame.copy() # the cached decode is never handed out, consumers may modify frames
+            self._specifications["frame-width"] = frame.shape[1]
+            self._specifications["frame-height"] = frame.shape[0]
+            self._specifications["frame-channels"] = frame.shape[2] if len(frame.shape) > 2 else 1
+            self._position = min(self._position + 1, len(self))
+            frame = self._record(frame, 0)
+        return frame
+    def _uncache(self):
+        '''
+        Drops the decoded frame, releasing its governed memory
+        '''
+        if self._mode in ["r"] and self._content is not None:
+            self._governor.release(self._source, self._content.nbytes)
+        self._content = None
+        self._modified = None
     def write(self, frame):
         if self._mode not in ["w"]:
             raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
@@ -0,0 +1,173 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+JPEG class decodes JPEG payloads using the optional `turbojpeg` package, with
+DCT domain scaled decoding (1/2, 1/4, 1/8) into reusable buffers, falling back
+to OpenCV reduced decoding when the package, or its library, is not installed
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import turbojpeg
+from xstream import Lock
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_reduced = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8} # scale -> OpenCV decoding flag
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class JPEG:
+    '''
+    JPEG decoder
+    '''
+    _turbo = None   # TurboJPEG library handle shared by all decoders, False if unavailable
+    def __init__(self, scale=1, backend=None, buffers=0):
+        '''
+        Initializes the decoder
+        args:
+            scale: represents the decoded size divider, one of 1, 2, 4, 8 (default = 1: for full size)
+            backend: represents the decoding library, 'turbojpeg' or 'opencv' (default = None: for 'turbojpeg' if installed, 'opencv' otherwise)
+            buffers: represents the number of reusable decoded frames buffers, a decoded frame is overwritten `buffers` decodings later, 'turbojpeg' backend only (default = 0: for a new frame per decoding)
+        returns:
+            a decoder instance
+        '''
+        if scale not in _reduced:
+            raise ValueError(f"Not supported {self.__class__.__name__} scale `{scale}`, expected one of {list(_reduced)}")
+        if backend not in [None, "turbojpeg", "opencv"]:
+            raise ValueError(f"Not supported {self.__class__.__name__} backend `{backend}`")
+        if backend in [None, "turbojpeg"] and JPEG._turbo is None:
+            try:
+                JPEG._turbo = turbojpeg.TurboJPEG() if turbojpeg is not None else False
+            except (OSError, RuntimeError):
+                JPEG._turbo = False # package installed without its library
+        if backend in ["turbojpeg"] and not JPEG._turbo:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} backend `{backend}`, `turbojpeg` package or library is not installed")
+        self._scale = scale
+        self._backend = "turbojpeg" if backend in [None, "turbojpeg"] and JPEG._turbo else "opencv"
+        self._buffers = [None] * buffers
+        self._next = 0          # index of next reused buffer
+        self._lock = Lock()
+    @property
+    def backend(self):
+        '''
+        Gets the decoding library in use
+        '''
+        return self._backend
+    def decode(self, payload):
+        '''
+        Decodes a JPEG payload into a BGR frame
+        args:
+            payload: represents the JPEG encoded bytes, any buffer-protocol object
+        returns:
+            the decoded frame on success, None otherwise
+        '''
+        data = cv2.numpy.frombuffer(payload, dtype=cv2.numpy.uint8)
+        if self._backend in ["opencv"]:
+            return cv2.imdecode(data, _reduced[self._scale])
+        try:
+            width, height, _, _ = JPEG._turbo.decode_header(data)
+            shape = (-(-height // self._scale), -(-width // self._scale), 3)
+            buffer = self._buffer(shape)
+            scaling = (1, self._scale) if self._scale > 1 else None
+            if buffer is None:
+                return JPEG._turbo.decode(data, scaling_factor=scaling)
+            return JPEG._turbo.decode(data, scaling_factor=scaling, dst=buffer)
+        except (OSError, ValueError):
+            return None # corrupted payload
+    def read(self, path):
+        '''
+        Decodes a JPEG file into a BGR frame
+        args:
+            path: represents the JPEG file path
+        returns:
+            the decoded frame on success, None otherwise
+        '''
+        if self._backend in ["opencv"]:
+            return cv2.imread(str(path), _reduced[self._scale])
+        try:
+            with open(path, "rb") as file:
+                return self.decode(file.read())
+        except OSError:
+            return None
+    def _buffer(self, shape):
+        '''
+        Gets the next reusable buffer, reallocated if the frames size changed
+        returns:
+            the buffer, None if buffers are not reused
+        '''
+        if not self._buffers:
+            return None
+        with self._lock:
+            index, self._next = self._next, (self._next + 1) % len(self._buffers)
+            if self._buffers[index] is None or self._buffers[index].shape != shape:
+                self._buffers[index] = cv2.numpy.empty(shape, dtype=cv2.numpy.uint8)
+            return self._buffers[index]
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
@@ -0,0 +1,359 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+MJPEG class reads `multipart/x-mixed-replace` JPEG streams directly over a
+persistent HTTP connection, it mimics the `cv2.VideoCapture` reading interface
+so it can be used as a stream content descriptor
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import http
+from xstream import socket
+from xstream import deque
+from xstream import Thread
+from xstream import Condition
+from xstream import ThreadPoolExecutor
+from xstream import urlsplit
+from xstream import _Governor
+from xstream import _JPEG
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class MJPEG:
+    '''
+    Multipart JPEG reader
+    '''
+    def __init__(self, url, latest=False, workers=0, timeout=10, capacity=1<<20, governor=None, scale=1, buffers=0):
+        '''
+        Initializes the reader, connects and decodes the first frame
+        args:
+            url: represents the http(s) link serving the multipart JPEG stream
+            latest: represents whether to read the latest received frame only, dropping the older ones (default = False)
+            workers: represents the number of frames decoded ahead on a thread pool, ignored if `latest` (default = 0: for decoding on read)
+            timeout: represents the connection timeout in seconds (default = 10)
+            capacity: represents the initial receive buffer capacity in bytes, grows to fit the largest part (default = 1 MiB)
+            governor: represents the memory governor accounting the frames decoded ahead (default = None: for the shared governor)
+            scale: represents the decoded frames size divider, one of 1, 2, 4, 8 (default = 1: for full size)
+            buffers: represents the number of reusable decoded frames buffers, a read frame is overwritten `buffers` decodings later (default = 0: for a new frame per decoding)
+        returns:
+            a reader instance, check `isOpened` for the connection status
+        '''
+        self._latest = latest
+        self._workers = workers
+        self._buffer = bytearray(capacity)  # receive buffer, reused for all parts
+        self._start = 0                     # index of first unparsed byte in receive buffer
+        self._end = 0                       # index of just after last received byte in receive buffer
+        self._boundary = None
+        self._socket = None
+        self._response = None
+        self._executor = None
+        self._pending = deque()             # frames being decoded ahead, ordered as received
+        self._governor = governor if governor is not None else _Governor.shared()
+        self._decoder = _JPEG(scale, buffers=buffers)
+        self._url = url
+        self._thread = None
+        self._condition = Condition()
+        self._payload = None                # latest received JPEG payload in `latest` mode
+        self._sequence = 0                  # number of received JPEG payloads in `latest` mode
+        self._consumed = 0                  # sequence of last read JPEG payload in `latest` mode
+        self._running = False
+        self._primed = None                 # first frame, decoded on opening to learn the frame specifications
+        self._primed_size = 0               # accounted size of a frame decoded ahead
+        self._specifications = dict()
+        self.dropped = 0                    # number of frames dropped in `latest` mode
+        self.sniffed = None                 # status and lower-cased headers of a non multipart response, answering its `Range: bytes=0-0` request
+        parts = urlsplit(url)
+        connection = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._connection = connection(parts.netloc, timeout=timeout)
+        try:
+            # multipart streams ignore the Range header, remote files answer it as a seekable reader probing request
+            self._connection.request("GET", (parts.path or "/") + (f"?{parts.query}" if parts.query else ""), headers={"Connection": "keep-alive", "Range": "bytes=0-0"})
+            self._socket = self._connection.sock    # kept as the connection forgets it for responses closing the connection
+            self._response = self._connection.getresponse()
+        except (OSError, http.client.HTTPException):
+            self.release()
+            return
+        kind, _, parameters = self._response.getheader("Content-Type", "").partition(";")
+        if self._response.status != 200 or kind.strip().lower() != "multipart/x-mixed-replace":
+            self.sniffed = (self._response.status, {key.lower(): value for key, value in self._response.getheaders()})
+            self.release()
+            return
+        for parameter in parameters.split(";"):
+            key, _, value = parameter.strip().partition("=")
+            if key.lower() == "boundary":
+                value = value.strip().strip('"').encode()
+                self._boundary = value if value.startswith(b"--") else b"--" + value
+        if self._boundary is None:
+            self.release()
+            return
+        self._primed = self._read()
+        if self._primed is None:
+            self.release()
+            return
+        self._specifications[cv2.CAP_PROP_FRAME_WIDTH] = self._primed.shape[1]
+        self._specifications[cv2.CAP_PROP_FRAME_HEIGHT] = self._primed.shape[0]
+        self._specifications[cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS] = self._primed.shape[2] if len(self._primed.shape) > 2 else 1
+        self._primed_size = self._primed.nbytes
+        self._running = True
+        if self._latest:
+            self._thread = Thread(target=self._receive, name=f"MJPEG {url}", daemon=True)
+            self._thread.start()
+        elif self._workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+    def isOpened(self):
+        '''
+        Gets the reader connection status
+        returns:
+            True if connected, False otherwise
+        '''
+        return self._response is not None
+    def read(self):
+        '''
+        Reads the next frame, or the latest received frame in `latest` mode
+        returns:
+            status, frame
+        '''
+        if self._primed is not None:
+            frame, self._primed = self._primed, None
+            return True, frame
+        if not self.isOpened():
+            return False, None
+        if self._latest:
+            with self._condition:
+                self._condition.wait_for(lambda: self._sequence > self._consumed or not self._running)
+                if self._sequence <= self._consumed:
+                    return False, None
+                self.dropped += self._sequence - self._consumed - 1
+                self._consumed = self._sequence
+                payload = self._payload
+            frame = self._decoder.decode(payload)
+        elif self._executor is not None:
+            size = self._primed_size
+            # decoding ahead is optional, thus never waits for the governed memory whatever the policy
+            while len(self._pending) < self._workers and self._governor.charge(self._url, size):
+                payload = self._part()
+                if payload is None:
+                    self._governor.release(self._url, size)
+                    break
+                self._pending.append(self._executor.submit(self._decoder.decode, bytes(payload)))
+                payload.release()
+            if self._pending:
+                future = self._pending.popleft()
+                self._governor.release(self._url, size)
+                frame = future.result()
+            else:
+                frame = self._read() # memory held by other readers of the source, decoded on read
+        else:
+            frame = self._read()
+        return frame is not None, frame
+    def get(self, property):
+        '''
+        Gets specified property value of the reader
+        args:
+            property: represents the `cv2.CAP_PROP_*` property for which to retrieve its value
+        returns:
+            property value, 0 if not available
+        '''
+        if property == cv2.CAP_PROP_FRAME_COUNT:
+            return -1
+        return self._specifications.get(property, 0)
+    def set(self, property, value):
+        '''
+        Sets specified property value of the reader, no property is settable
+        returns:
+            False
+        '''
+        return False
+    def release(self):
+        '''
+        Closes the connection and stops any background receiving/decoding
+        '''
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            if self._socket is not None:
+                try:
+                    # wakes the receiving thread up if blocked on the socket
+                    self._socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self._thread.join()
+            self._thread = None
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+        self._connection.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._governor.release(self._url, self._primed_size * len(self._pending))
+        self._pending.clear()
+    def _read(self):
+        '''
+        Receives and decodes the next frame in place from the receive buffer
+        returns:
+            the decoded frame on success, None otherwise
+        '''
+        payload = self._part()
+        if payload is None:
+            return None
+        frame = self._decoder.decode(payload)
+        payload.release()
+        return frame
+    def _receive(self):
+        '''
+        Keeps receiving JPEG payloads, keeping the latest one only, runs on the `latest` mode thread
+        '''
+        while self._running:
+            try:
+                payload = self._part()
+            except (OSError, ValueError, http.client.HTTPException):
+                payload = None
+            with self._condition:
+                if payload is None:
+                    self._running = False
+                else:
+                    self._payload = bytes(payload)
+                    self._sequence += 1
+                    payload.release()
+                self._condition.notify_all()
+    def _fill(self):
+        '''
+        Receives more bytes into the receive buffer, compacting or growing it as needed
+        returns:
+            number of received bytes, 0 on end of stream
+        '''
+        if self._start > 0:
+            self._buffer[:self._end - self._start] = self._buffer[self._start:self._end]
+            self._end -= self._start
+            self._start = 0
+        if self._end == len(self._buffer):
+            self._buffer.extend(bytes(len(self._buffer)))
+        with memoryview(self._buffer) as view:
+            count = self._response.readinto1(view[self._end:])
+        self._end += count or 0
+        return count or 0
+    def _find(self, pattern, start):
+        '''
+        Finds a pattern within the received bytes, receiving more bytes until found
+        args:
+            pattern: represents the bytes to be found
+            start: represents the offset from first unparsed byte to start searching from
+        returns:
+            offset from first unparsed byte of the found pattern, None on end of stream
+        '''
+        while True:
+            index = self._buffer.find(pattern, self._start + start, self._end)
+            if index != -1:
+                return index - self._start
+            start = max(start, self._end - self._start - len(pattern) + 1)
+            if self._fill() == 0:
+                return None
+    def _part(self):
+        '''
+        Parses the next JPEG part within the receive buffer
+        returns:
+            a view of the JPEG payload to be released before the next parsing, None on end of stream
+        '''
+        if self._response is None:
+            return None
+        boundary = self._find(self._boundary, 0)
+        if boundary is None:
+            return None
+        headers = self._find(b"\r\n\r\n", boundary)
+        if headers is None:
+            return None
+        length = None
+        for line in bytes(self._buffer[self._start + boundary:self._start + headers]).split(b"\r\n")[1:]:
+            key, _, value = line.partition(b":")
+            if key.strip().lower() == b"content-length" and value.strip().isdigit():
+                length = int(value)
+        begin = headers + 4
+        if length is not None:
+            while self._end - self._start < begin + length:
+                if self._fill() == 0:
+                    return None
+            end = begin + length
+        else:
+            end = self._find(self._boundary, begin)
+            if end is None:
+                # last part may not be followed by a closing boundary
+                end = self._end - self._start
+                if end <= begin:
+                    return None
+            end -= 2 if self._buffer[self._start + end - 2:self._start + end] == b"\r\n" else 0
+        payload = memoryview(self._buffer)[self._start + begin:self._start + end]
+        self._start += end
+        return payload
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
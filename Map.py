@@ -0,0 +1,212 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Map class applies a function to every frame of a stream on a thread or process
+pool, with a bounded number of frames in flight, yielding results in frames
+order or as soon as completed
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import deque
+from xstream import ThreadPoolExecutor, ProcessPoolExecutor
+from xstream import wait, FIRST_COMPLETED
+from xstream import _Governor
+from xstream import _Stream
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Map(_Stream):
+    '''
+    Parallel per frame function stream
+    '''
+    def __init__(self, source, function, workers=4, backend="thread", ordered=True, inflight=None, executor=None, governor=None):
+        '''
+        Initializes the stream
+        args:
+            source: represents the stream, or any iterable of frames, from which to read frames
+            function: represents the function applied to every frame, MUST be picklable for the 'process' backend
+            workers: represents the number of parallel function calls (default = 4)
+            backend: represents the pool running the function calls (default = 'thread', 'process': for functions holding the GIL)
+            ordered: represents whether results are yielded in frames order, otherwise as soon as completed (default = True)
+            inflight: represents the maximum number of frames read but not yielded yet (default = None: for twice the workers)
+            executor: represents the pool of another map to run the function calls on, left open on closing (default = None: for an own pool)
+            governor: represents the memory governor accounting the frames in flight, all frames are mapped thus waited for under the 'drop' policy (default = None: for the shared governor)
+        returns:
+            a stream instance
+        '''
+        super().__init__(source)
+        if backend not in ["thread", "process"]:
+            raise ValueError(f"Not supported {self.__class__.__name__} backend `{backend}` for stream source `{source}`")
+        self._type = "Map"
+        self._function = function
+        self._workers = workers
+        self._backend = backend
+        self._ordered = ordered
+        self._inflight = max(1, inflight or 2 * workers)
+        self._executor = executor
+        self._owned = executor is None  # whether the pool is created, thus shut down, by the map
+        self._governor = governor if governor is not None else _Governor.shared()
+        self._owner = str(getattr(getattr(source, "_stream", source), "_source", f"{self._type}@{id(self)}")) # governed source
+        self._frames = None         # iterator over the source frames
+        self._pending = deque()     # function calls in flight, ordered as frames read
+        self._index = None          # index of last yielded result in frames order, None if unordered
+        self._ended = False
+        self.open()
+    def __len__(self):
+        return len(self._source)
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            # sliced frames are mapped through a new pipeline sharing the pool
+            return Map(self._source[key], self._function, self._workers, self._backend, self._ordered, self._inflight, self._executor, self._governor)
+        if isinstance(key, (list, tuple)) or hasattr(key, "__array__"):
+            return [self._function(frame) for frame in self._source[key]]
+        return self._function(self._source[key])
+    def open(self, mode="r"):
+        if mode not in ["r"]:
+            raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        self._mode = mode
+        if self._executor is None:
+            self._executor = (ThreadPoolExecutor if self._backend in ["thread"] else ProcessPoolExecutor)(max_workers=self._workers)
+            self._owned = True
+        self._frames = iter(self._source)
+        return True
+    def close(self):
+        self._cancel()
+        if self._executor is not None and self._owned:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        return True
+    def tell(self):
+        return self._index
+    def seek(self, index):
+        self._cancel()
+        status = self._source.seek(index)
+        self._frames = iter(self._source)
+        self._index = index - 1 if status and self._ordered else None
+        return status
+    def __next__(self):
+        # the end is told by the pipeline, as the function may return None for a frame
+        status, result = self._next()
+        if not status:
+            raise StopIteration()
+        return result
+    def read(self):
+        if self._mode not in ["r"]:
+            raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
+        return self._next()[1]
+    def _next(self):
+        '''
+        Gets the next function result
+        returns:
+            (True, result) on success, (False, None) once all frames are mapped
+        '''
+        while not self._ended and len(self._pending) < self._inflight:
+            try:
+                frame = next(self._frames)
+            except StopIteration:
+                self._ended = True
+                break
+            if hasattr(frame, "nbytes"):
+                # reading ahead waits for the governed memory, released as soon as the function calls complete
+                frame, charged = self._governor.admit(self._owner, frame)
+                if not charged:
+                    self._governor.charge(self._owner, frame.nbytes, timeout=None)
+            future = self._executor.submit(self._function, frame)
+            if hasattr(frame, "nbytes"):
+                future.add_done_callback(lambda _, size=frame.nbytes: self._governor.release(self._owner, size))
+            self._pending.append(future)
+        if not self._pending:
+            return False, None
+        if self._ordered:
+            future = self._pending.popleft()
+            self._index = self._index + 1 if self._index is not None else 0
+        else:
+            done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+            future = next(future for future in self._pending if future in done)
+            self._pending.remove(future)
+        return True, future.result()
+    def map(self, function, workers=4, backend="thread", ordered=True, inflight=None, governor=None):
+        return Map(self, function, workers, backend, ordered, inflight, governor=governor)
+    def write(self):
+        if self._mode not in []:
+            raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
+        return False
+    def _cancel(self):
+        '''
+        Drops the function calls in flight
+        '''
+        for future in self._pending:
+            future.cancel()
+        wait(self._pending)
+        self._pending.clear()
+        self._ended = False
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
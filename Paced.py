@@ -0,0 +1,162 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Paced class replays the frames of a content descriptor at its frame rate times
+a speed, like a live source, frames are waited for when read early, buffered
+when read late and skipped once older than the buffered backlog, the content
+is rewound once ended, it mimics the
+`cv2.VideoCapture` reading interface so it can be used as a stream content
+descriptor
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import time
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Paced:
+    '''
+    Live-like paced reader
+    '''
+    def __init__(self, capture, speed=1.0, loop=True, backlog=1.0):
+        '''
+        Initializes the reader, the replay clock starts on the first read frame
+        args:
+            capture: represents the opened content descriptor to be paced
+            speed: represents the replay speed, as a multiple of the content frame rate (default = 1.0: for real time)
+            loop: represents whether the content is rewound once ended (default = True)
+            backlog: represents the seconds of frames a late reader catches up on, like live sources buffers, older frames are skipped, frames are grabbed on read rather than held (default = 1.0)
+        returns:
+            a reader instance
+        '''
+        self._capture = capture
+        self._rate = (capture.get(cv2.CAP_PROP_FPS) or 30) * speed
+        self._loop = loop
+        self._backlog = max(1, int(backlog * self._rate))
+        self._start = None      # replay clock origin, `time.monotonic` clock
+        self._position = 0      # index of next frame to be read, since replay start
+        self.dropped = 0        # number of frames skipped for being older than the backlog
+    def isOpened(self):
+        return self._capture.isOpened()
+    def grab(self):
+        '''
+        Waits for the next due frame, skipping the frames older than the backlog
+        returns:
+            True on success, False otherwise
+        '''
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now - self._position / self._rate
+        due = int((now - self._start) * self._rate)
+        if due < self._position:
+            time.sleep(self._start + self._position / self._rate - now)
+        excess = due - self._backlog - self._position
+        if excess > self._backlog:
+            # the reader stalled, the clock is shifted rather than decoding all missed frames
+            self._start += (excess - self._backlog) / self._rate
+            excess = self._backlog
+        for _ in range(excess):
+            if not self._next():
+                return False
+            self.dropped += 1
+        return self._next()
+    def retrieve(self, image=None):
+        return self._capture.retrieve() if image is None else self._capture.retrieve(image)
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+    def get(self, property):
+        if property == cv2.CAP_PROP_POS_FRAMES:
+            return self._position
+        if property == cv2.CAP_PROP_POS_MSEC:
+            return 1000 * max(0, self._position - 1) / self._rate # replay time of the last grabbed frame, as captures do
+        if property == cv2.CAP_PROP_FPS:
+            return self._rate
+        if property == cv2.CAP_PROP_FRAME_COUNT:
+            return -1 # live-like, no end
+        return self._capture.get(property)
+    def set(self, property, value):
+        return False
+    def release(self):
+        self._capture.release()
+    def _next(self):
+        '''
+        Grabs the next content frame, rewinding the content once ended
+        '''
+        status = self._capture.grab()
+        if not status and self._loop and self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0):
+            status = self._capture.grab()
+        self._position += status
+        return status
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
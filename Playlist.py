@@ -0,0 +1,254 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Playlist class concatenates many video files into one stream with a global
+frame index, segments lengths are probed from container headers, the next
+segment is opened and its first frame decoded in background so sequential
+reading does not stall at segments boundaries
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import glob
+from xstream import Path
+from xstream import bisect_right
+from xstream import ThreadPoolExecutor
+from xstream import _Governor
+from xstream import _Probe
+from xstream import _Stream
+from xstream import _Video
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Playlist(_Stream):
+    def __init__(self, source):
+        super().__init__(source)
+        if isinstance(self._source, (str, Path)):
+            # glob pattern, segments are ordered by path
+            segments = sorted(glob.glob(str(self._source)))
+        elif isinstance(self._source, (list, tuple)):
+            segments = [str(segment) for segment in self._source]
+        else:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source-type `{type(self._source)}`")
+        self._type = "Media/Playlist"
+        self._segments = segments
+        self._offsets = None    # index of first frame of each segment, then total number of frames
+        self._segment = None    # index of current segment
+        self._current = None    # opened current segment
+        self._primed = None     # first frame of current segment, decoded in background
+        self._next = None       # future of next segment opening, (segment index, opened segment, first frame)
+        self._position = 0      # index of next frame to be read
+        self._options = dict()
+        self._executor = None
+        self._governor = None
+        self._owner = str(self._source) # governed source
+        self.failed = []        # segments that could not be opened, skipped
+        self._specifications["frame-rate"] = None
+        self._specifications["frame-count"] = None
+        self._specifications["frame-width"] = None
+        self._specifications["frame-height"] = None
+        self._specifications["frame-channels"] = None
+        self._specifications["segments"] = len(segments)
+    def __len__(self):
+        return self._offsets[-1]
+    def open(self, mode="r", preroll=True, governor=None, **options):
+        if mode not in ["r"]:
+            raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        self._mode = mode
+        self._options = options
+        self._governor = governor if governor is not None else _Governor.shared()
+        self._offsets = [0]
+        probed = _Probe.shared().probe_many(self._segments)
+        # unreadable segments have no frames, thus are skipped
+        self.failed = [segment for segment, specifications in zip(self._segments, probed) if not specifications]
+        for specifications in probed:
+            self._offsets.append(self._offsets[-1] + (int(specifications["frame-count"]) if specifications else 0))
+        specifications = next((specifications for specifications in probed if specifications), None)
+        if specifications is not None:
+            self._specifications["frame-rate"] = specifications["frame-rate"]
+        self._specifications["frame-count"] = self._offsets[-1]
+        self._executor = ThreadPoolExecutor(max_workers=1) if preroll else None
+        # reading starts from the first segment that opens, its decoded frames size is the playlist one
+        for segment in range(len(self._segments)):
+            if self._offsets[segment + 1] > self._offsets[segment] and self.seek(self._offsets[segment]):
+                for property in ["frame-width", "frame-height", "frame-channels"]:
+                    self._specifications[property] = self._current.get(property)
+                return True
+        return len(self) == 0
+    def close(self):
+        self._switch(None)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        return True
+    def tell(self):
+        return self._position
+    def seek(self, index):
+        if not 0 <= index < len(self):
+            return False
+        segment = bisect_right(self._offsets, index) - 1
+        if segment != self._segment:
+            self._switch(segment)
+        if self._current is None:
+            return False
+        local = index - self._offsets[segment]
+        if self._primed is not None and local == 0:
+            status = True # first frame already decoded
+        else:
+            self._unprime()
+            status = self._current.seek(local)
+        self._position = index
+        return status
+    def read(self):
+        if self._mode not in ["r"]:
+            raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
+        while self._segment is not None:
+            if self._current is not None:
+                frame = self._unprime()
+                if frame is None:
+                    frame = self._current.read()
+                if frame is not None:
+                    self._position += 1
+                    return self._record(frame, self._position - 1)
+            # ended or failed segments are followed by the next one
+            if self._segment + 1 >= len(self._segments):
+                return None
+            self._switch(self._segment + 1)
+            self._position = self._offsets[self._segment]
+        return None
+    def get(self, property):
+        if property in self._specifications:
+            return self._specifications[property]
+        return self._current.get(property) if self._current is not None else None
+    def write(self):
+        if self._mode not in []:
+            raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
+        return False
+    def _preroll(self, segment):
+        '''
+        Opens a segment and decodes its first frame, accounted to the governor until read
+        returns:
+            (segment index, opened segment, first frame)
+        '''
+        try:
+            video = _Video(self._segments[segment])
+        except RuntimeError:
+            return segment, None, None # not a video file
+        if not video.open("r", **self._options):
+            video.close()
+            return segment, None, None
+        frame = video.read()
+        if frame is not None:
+            # decoding ahead is optional, thus never waits for the governed memory, frames not accounted are decoded again on read
+            frame, charged = self._governor.admit(self._owner, frame, timeout=0)
+            if not charged:
+                frame = None if video.seek(0) else frame
+        return segment, video, frame
+    def _unprime(self):
+        '''
+        Takes the first frame of current segment decoded ahead
+        returns:
+            the decoded frame, None if not decoded ahead
+        '''
+        frame, self._primed = self._primed, None
+        if frame is not None:
+            self._governor.release(self._owner, frame.nbytes)
+        return frame
+    def _switch(self, segment):
+        '''
+        Makes a segment the current one, using the background opened segment if it is the one, then opens the following segment in background
+        args:
+            segment: represents the segment index, None for closing all segments
+        '''
+        if self._current is not None:
+            self._current.close()
+        self._current = None
+        self._unprime()
+        if self._next is not None:
+            opened, video, frame = self._next.result()
+            self._next = None
+            if opened == segment:
+                self._current, self._primed = video, frame
+            else:
+                if frame is not None:
+                    self._governor.release(self._owner, frame.nbytes)
+                if video is not None:
+                    video.close()
+        self._segment = segment
+        if segment is None:
+            return
+        if self._current is None:
+            _, self._current, self._primed = self._preroll(segment)
+        if self._current is None and self._segments[segment] not in self.failed:
+            self.failed.append(self._segments[segment])
+        if self._executor is not None and segment + 1 < len(self._segments):
+            self._next = self._executor.submit(self._preroll, segment + 1)
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
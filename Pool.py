@@ -0,0 +1,212 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Pool class keeps recently closed capture handles warm so re-opening the same
+source with the same parameters skips the costly capture initialization
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import time
+from xstream import Lock, Timer
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Pool:
+    '''
+    Warm capture handles pool
+    '''
+    _shared = None
+    def __init__(self, size=16, idle=30):
+        '''
+        Initializes the pool
+        args:
+            size: represents the maximum number of idle handles kept, least recently closed are evicted first (default = 16)
+            idle: represents the maximum time in seconds an idle handle is kept (default = 30)
+        returns:
+            a pool instance
+        '''
+        self._size = size
+        self._idle = idle
+        self._lock = Lock()
+        self._entries = []  # idle handles, (key, handle, release time), least recently closed first
+        self._timer = None  # releases expired idle handles without pool activity
+        self.hits = 0       # number of acquisitions served by an idle handle
+        self.misses = 0     # number of acquisitions creating a new handle
+    def __len__(self):
+        return len(self._entries)
+    @classmethod
+    def shared(cls):
+        '''
+        Gets the pool shared among all streams
+        returns:
+            the shared pool instance
+        '''
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    @classmethod
+    def share(cls, pool):
+        '''
+        Sets the pool shared among all streams
+        args:
+            pool: represents the pool instance to be shared
+        returns:
+            the shared pool instance
+        '''
+        cls._shared = pool
+        return cls._shared
+    def acquire(self, key, factory):
+        '''
+        Gets an idle handle for a key, or creates a new one
+        args:
+            key: represents the handle key, ex: stream type, source and open parameters
+            factory: represents a callable creating a new handle
+        returns:
+            the handle
+        '''
+        with self._lock:
+            expired = self._expire()
+            handle = None
+            for index in range(len(self._entries) - 1, -1, -1):
+                if self._entries[index][0] == key:
+                    handle = self._entries.pop(index)[1]
+                    break
+        for entry in expired:
+            entry[1].release()
+        if handle is not None and handle.isOpened():
+            with self._lock:
+                self.hits += 1
+            return handle
+        if handle is not None:
+            handle.release()
+        with self._lock:
+            self.misses += 1
+        return factory()
+    def release(self, key, handle):
+        '''
+        Keeps a handle idle for later acquisition, evicting expired and least recently closed handles
+        args:
+            key: represents the handle key
+            handle: represents the handle
+        '''
+        if not handle.isOpened():
+            handle.release()
+            return
+        with self._lock:
+            self._entries.append((key, handle, time.monotonic()))
+            expired = self._expire()
+            while len(self._entries) > self._size:
+                expired.append(self._entries.pop(0))
+            self._schedule()
+        for entry in expired:
+            entry[1].release()
+    def clear(self):
+        '''
+        Releases all idle handles
+        '''
+        with self._lock:
+            expired, self._entries = self._entries, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for entry in expired:
+            entry[1].release()
+    def _expire(self):
+        '''
+        Removes the idle handles kept longer than the idle timeout, caller MUST hold the pool lock
+        returns:
+            list of removed entries to be released by the caller
+        '''
+        deadline = time.monotonic() - self._idle
+        expired = [entry for entry in self._entries if entry[2] <= deadline]
+        self._entries = [entry for entry in self._entries if entry[2] > deadline]
+        return expired
+    def _schedule(self):
+        '''
+        Schedules the release of the least recently closed idle handle once expired, caller MUST hold the pool lock
+        '''
+        if self._timer is not None or not self._entries:
+            return
+        self._timer = Timer(max(0, self._entries[0][2] + self._idle - time.monotonic()), self._sweep)
+        self._timer.daemon = True
+        self._timer.start()
+    def _sweep(self):
+        '''
+        Releases the expired idle handles, runs on the timer thread
+        '''
+        with self._lock:
+            self._timer = None
+            expired = self._expire()
+            self._schedule()
+        for entry in expired:
+            entry[1].release()
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
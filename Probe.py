@@ -0,0 +1,367 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Probe class reads video specifications from container headers only (mp4 sample
+tables, avi stream headers) without initializing any decoder, caching them by
+path, size and modification time
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import json
+from xstream import struct
+from xstream import Path
+from xstream import Lock
+from xstream import ThreadPoolExecutor
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_mp4_containers = [b"moov", b"trak", b"mdia", b"minf", b"stbl"]
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+def _mp4_boxes(data, start, end):
+    '''
+    Iterates over mp4 boxes within a buffer
+    args:
+        data: represents the buffer holding the boxes
+        start: represents the offset of first box
+        end: represents the offset of just after last box
+    returns:
+        generator of (type, payload start, payload end)
+    '''
+    while start + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", data, start)
+        header = 8
+        if size == 1:
+            size, header = struct.unpack_from(">Q", data, start + 8)[0], 16
+        elif size == 0:
+            size = end - start
+        if size < header:
+            return
+        yield kind, start + header, min(start + size, end)
+        start += size
+
+def _mp4_find(data, start, end, path):
+    '''
+    Finds a nested mp4 box by its path of types, ex: [b"mdia", b"mdhd"]
+    returns:
+        (payload start, payload end) if found, None otherwise
+    '''
+    for kind, begin, finish in _mp4_boxes(data, start, end):
+        if kind == path[0]:
+            return (begin, finish) if len(path) == 1 else _mp4_find(data, begin, finish, path[1:])
+    return None
+
+def _mp4(file, keyframes=False):
+    '''
+    Reads the first video track specifications of an mp4 file, its frame size is the stored one, before the rotation applied by decoders
+    args:
+        file: represents the binary, seekable, file
+        keyframes: represents whether to include the key frames indices as `key-frames` (default = False)
+    returns:
+        specifications on success, None otherwise
+    '''
+    moov = None
+    offset = 0
+    while moov is None:
+        file.seek(offset)
+        header = file.read(16)
+        if len(header) < 8:
+            return None
+        size, kind = struct.unpack_from(">I4s", header)
+        length = 8
+        if size == 1:
+            size, length = struct.unpack_from(">Q", header, 8)[0], 16
+        elif size == 0:
+            size = file.seek(0, 2) - offset
+        if size < length:
+            return None
+        if kind == b"moov":
+            file.seek(offset + length)
+            moov = file.read(size - length)
+        offset += size
+    for kind, start, end in _mp4_boxes(moov, 0, len(moov)):
+        if kind != b"trak":
+            continue
+        hdlr = _mp4_find(moov, start, end, [b"mdia", b"hdlr"])
+        if hdlr is None or moov[hdlr[0] + 8:hdlr[0] + 12] != b"vide":
+            continue
+        mdhd = _mp4_find(moov, start, end, [b"mdia", b"mdhd"])
+        stbl = _mp4_find(moov, start, end, [b"mdia", b"minf", b"stbl"])
+        if mdhd is None or stbl is None:
+            return None
+        timescale = struct.unpack_from(">I", moov, mdhd[0] + (20 if moov[mdhd[0]] == 1 else 12))[0]
+        stsd = _mp4_find(moov, stbl[0], stbl[1], [b"stsd"])
+        stsz = _mp4_find(moov, stbl[0], stbl[1], [b"stsz"])
+        stts = _mp4_find(moov, stbl[0], stbl[1], [b"stts"])
+        stss = _mp4_find(moov, stbl[0], stbl[1], [b"stss"])
+        if stsd is None or stsz is None or stts is None:
+            return None
+        width, height = struct.unpack_from(">HH", moov, stsd[0] + 8 + 32)
+        count = struct.unpack_from(">I", moov, stsz[0] + 8)[0]
+        entries = struct.unpack_from(">I", moov, stts[0] + 4)[0]
+        duration = sum(samples * delta for samples, delta in struct.iter_unpack(">II", moov[stts[0] + 8:stts[0] + 8 + 8 * entries]))
+        if count == 0 or duration == 0:
+            return None # fragmented files keep their samples in `moof` boxes, not indexed in `moov`
+        specifications = {
+            "frame-rate": count * timescale / duration,
+            "frame-count": count,
+            "frame-width": width,
+            "frame-height": height,
+            "frame-channels": 3,
+            }
+        if keyframes and stss is None:
+            specifications["key-frames"] = list(range(count)) # all frames are key frames
+        elif keyframes:
+            entries = struct.unpack_from(">I", moov, stss[0] + 4)[0]
+            specifications["key-frames"] = [sample - 1 for sample in struct.unpack_from(f">{entries}I", moov, stss[0] + 8)]
+        return specifications
+    return None
+
+def _avi(file):
+    '''
+    Reads the first video stream specifications of an avi file
+    args:
+        file: represents the binary, seekable, file
+    returns:
+        specifications on success, None otherwise
+    '''
+    file.seek(0)
+    riff = file.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"AVI ":
+        return None
+    header = file.read(12)
+    if len(header) < 12 or header[:4] != b"LIST" or header[8:12] != b"hdrl":
+        return None
+    hdrl = file.read(struct.unpack_from("<I", header, 4)[0] - 4)
+    specifications = None
+    total = None
+    def chunks(data, start, end):
+        while start + 8 <= end:
+            kind, size = struct.unpack_from("<4sI", data, start)
+            yield kind, start + 8, min(start + 8 + size, end)
+            start += 8 + size + (size & 1)
+    for kind, start, end in chunks(hdrl, 0, len(hdrl)):
+        if kind == b"avih":
+            total = struct.unpack_from("<I", hdrl, start + 16)[0]
+        elif kind == b"LIST" and hdrl[start:start + 4] == b"strl" and specifications is None:
+            for inner, begin, finish in chunks(hdrl, start + 4, end):
+                if inner == b"strh" and hdrl[begin:begin + 4] != b"vids":
+                    break
+                if inner == b"strh":
+                    scale, rate, _, length = struct.unpack_from("<IIII", hdrl, begin + 20)
+                    specifications = {"frame-rate": rate / scale if scale else 0.0, "frame-count": length}
+                elif inner == b"strf" and specifications is not None:
+                    width, height = struct.unpack_from("<ii", hdrl, begin + 4)
+                    specifications.update({"frame-width": width, "frame-height": abs(height), "frame-channels": 3})
+        elif kind == b"LIST" and hdrl[start:start + 4] == b"odml":
+            for inner, begin, finish in chunks(hdrl, start + 4, end):
+                if inner == b"dmlh":
+                    total = struct.unpack_from("<I", hdrl, begin)[0]
+    if specifications is None or "frame-width" not in specifications or not specifications["frame-count"] or not specifications["frame-rate"]:
+        return None
+    if total is not None and total > specifications["frame-count"]:
+        # OpenDML files announce the total number of frames of all RIFF segments separately
+        specifications["frame-count"] = total
+    return specifications
+
+def _capture(path):
+    '''
+    Reads video specifications by opening a capture, used for containers not parsed natively
+    '''
+    capture = cv2.VideoCapture(str(path))
+    if not capture.isOpened():
+        return None
+    specifications = {
+        "frame-rate": capture.get(cv2.CAP_PROP_FPS),
+        "frame-count": int(capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+        "frame-width": int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "frame-height": int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "frame-channels": 3,
+        }
+    capture.release()
+    return specifications
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Probe:
+    '''
+    Caching video specifications prober
+    '''
+    _shared = None
+    def __init__(self, path=None, workers=8):
+        '''
+        Initializes the prober
+        args:
+            path: represents a json-lines file path to persist probed specifications into (default = None: for memory only)
+            workers: represents the number of concurrent probes used by `probe_many` (default = 8)
+        returns:
+            a prober instance
+        '''
+        self._path = Path(path) if path is not None else None
+        self._workers = workers
+        self._lock = Lock()
+        self._entries = dict()  # probed specifications without key frames, (path, size, modification time) -> specifications
+        if self._path is not None and self._path.exists():
+            with open(self._path) as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue # partially written line
+                    self._entries[tuple(entry["key"])] = entry["specifications"]
+    @classmethod
+    def shared(cls):
+        '''
+        Gets the prober shared among all streams
+        returns:
+            the shared prober instance
+        '''
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    @classmethod
+    def share(cls, probe):
+        '''
+        Sets the prober shared among all streams
+        args:
+            probe: represents the prober instance to be shared
+        returns:
+            the shared prober instance
+        '''
+        cls._shared = probe
+        return cls._shared
+    def probe(self, path, keyframes=False):
+        '''
+        Gets the specifications of a video file, key frames are parsed on each request rather than cached
+        args:
+            path: represents the video file path
+            keyframes: represents whether to include the key frames indices as `key-frames`, if available (default = False)
+        returns:
+            specifications on success, None otherwise, ex: unreadable file, mp4 frame sizes are the stored ones, before the rotation applied by decoders
+        '''
+        path = Path(path).resolve()
+        try:
+            status = path.stat()
+        except OSError:
+            return None
+        key = (str(path), status.st_size, status.st_mtime_ns)
+        with self._lock:
+            specifications = self._entries.get(key)
+        probed = None
+        if specifications is None or keyframes:
+            try:
+                with open(path, "rb") as file:
+                    probed = self.probe_file(file, keyframes)
+            except OSError:
+                return None
+        if specifications is None:
+            specifications = probed or _capture(path)
+            if specifications is None:
+                return None
+            # key frames may be long, they are not cached
+            specifications = {name: value for name, value in specifications.items() if name != "key-frames"}
+            with self._lock:
+                self._entries[key] = specifications
+                if self._path is not None:
+                    with open(self._path, "a") as file:
+                        file.write(json.dumps({"key": key, "specifications": specifications}) + "\n")
+        specifications = dict(specifications)
+        if probed is not None and "key-frames" in probed:
+            specifications["key-frames"] = probed["key-frames"]
+        return specifications
+    def probe_file(self, file, keyframes=False):
+        '''
+        Gets the specifications of a video from its container headers, without caching
+        args:
+            file: represents the binary, seekable, file object, ex: a range reader of a remote video
+            keyframes: represents whether to include the key frames indices as `key-frames`, if available (default = False)
+        returns:
+            specifications on success, None otherwise, mp4 frame sizes are the stored ones, before the rotation applied by decoders
+        '''
+        try:
+            specifications = _mp4(file, keyframes) or _avi(file)
+        except struct.error:
+            specifications = None # truncated or corrupted headers
+        return specifications
+    def probe_many(self, paths, workers=None, keyframes=False):
+        '''
+        Gets the specifications of many video files concurrently
+        args:
+            paths: represents the video files paths
+            workers: represents the number of concurrent probes (default = None: for the prober `workers`)
+            keyframes: represents whether to include the key frames indices as `key-frames`, if available (default = False)
+        returns:
+            list of specifications ordered as the paths, None for failed ones
+        '''
+        paths = list(paths)
+        workers = workers if workers is not None else self._workers
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as executor:
+            return list(executor.map(lambda path: self.probe(path, keyframes), paths))
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
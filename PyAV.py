@@ -0,0 +1,261 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+PyAV class decodes video packets using the optional `av` package with codec
+level threading, exposing per frame pts and key frame flag, it mimics the
+`cv2.VideoCapture` reading interface so it can be used as a stream content
+descriptor
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import av
+from xstream import cv2
+from xstream import Path
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_pixel_formats = {"bgr": "bgr24", "rgb": "rgb24", "gray": "gray", "yuv": "yuv420p", "nv12": "nv12"} # stream pixel format -> decoder pixel format
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class PyAV:
+    '''
+    PyAV video reader
+    '''
+    def __init__(self, source, format="bgr", threads=0, options=None):
+        '''
+        Initializes the reader, opening the first video stream of the source
+        args:
+            source: represents the video path/link or a binary file object
+            format: represents the frames pixel format, one of 'bgr', 'rgb', 'gray', 'yuv', 'nv12' or any ffmpeg pixel format (default = 'bgr')
+            threads: represents the number of decoder threads (default = 0: for ffmpeg choice)
+            options: represents the ffmpeg demuxer options, ex: {'rtsp_transport': 'tcp'} (default = None)
+        returns:
+            a reader instance, check `isOpened` for the opening status
+        '''
+        if av is None:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} reader for source `{source}`, `av` package is not installed")
+        self._format = _pixel_formats.get(format, format)
+        self._container = None
+        self._stream = None
+        self._frames = None     # decoded frames generator
+        self._frame = None      # last decoded frame
+        self._position = 0      # index of next frame to be read
+        try:
+            self._container = av.open(str(source) if isinstance(source, (str, Path)) else source, options=options or {})
+            self._stream = self._container.streams.video[0]
+        except (av.error.FFmpegError, IndexError, OSError):
+            self.release()
+            return
+        # frame and slice level threading
+        self._stream.thread_type = "AUTO"
+        self._stream.codec_context.thread_count = threads
+        self._rate = float(self._stream.average_rate or self._stream.guessed_rate or 0)
+        self._start = self._stream.start_time or 0
+        self._frames = self._container.decode(self._stream)
+    def isOpened(self):
+        '''
+        Gets the reader status
+        returns:
+            True if opened, False otherwise
+        '''
+        return self._container is not None
+    def grab(self):
+        '''
+        Decodes the next frame without converting it
+        returns:
+            True on success, False otherwise
+        '''
+        try:
+            self._frame = next(self._frames)
+        except (StopIteration, av.error.FFmpegError):
+            self._frame = None
+            return False
+        self._position = self._index(self._frame) + 1
+        return True
+    def retrieve(self):
+        '''
+        Converts the last decoded frame into the requested pixel format
+        returns:
+            status, frame
+        '''
+        if self._frame is None:
+            return False, None
+        return True, self._frame.to_ndarray(format=self._format)
+    def read(self):
+        '''
+        Decodes and converts the next frame into the requested pixel format
+        returns:
+            status, frame
+        '''
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+    def get(self, property):
+        '''
+        Gets specified property value of the reader
+        args:
+            property: represents a `cv2.CAP_PROP_*` property, or one of 'frame-pts', 'frame-time', 'frame-keyframe', 'time-base' for the last decoded frame
+        returns:
+            property value, 0 if not available
+        '''
+        if self._stream is None:
+            return 0
+        if property == "frame-pts":
+            return self._frame.pts if self._frame is not None else None
+        if property == "frame-time":
+            return self._frame.time if self._frame is not None else None
+        if property == "frame-keyframe":
+            return bool(self._frame.key_frame) if self._frame is not None else None
+        if property == "time-base":
+            return self._stream.time_base
+        if property == cv2.CAP_PROP_FPS:
+            return self._rate
+        if property == cv2.CAP_PROP_FRAME_COUNT:
+            return self._stream.frames or -1
+        if property == cv2.CAP_PROP_FRAME_WIDTH:
+            return self._stream.codec_context.width
+        if property == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self._stream.codec_context.height
+        if property == cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS:
+            return 1 if self._format in ["gray"] else 3
+        if property == cv2.CAP_PROP_POS_FRAMES:
+            return self._position
+        if property == cv2.CAP_PROP_POS_MSEC:
+            return 1000 * self._position / self._rate if self._rate else 0
+        return 0
+    def set(self, property, value):
+        '''
+        Sets specified property value of the reader, only `cv2.CAP_PROP_POS_FRAMES` is settable
+        returns:
+            True on success, False otherwise
+        '''
+        if property != cv2.CAP_PROP_POS_FRAMES or self._stream is None or not self._rate:
+            return False
+        index = int(value)
+        # seek to the key frame preceding the index, then decode forward to it
+        self._container.seek(self._start + int(index / self._rate / self._stream.time_base), stream=self._stream, backward=True)
+        self._frames = self._container.decode(self._stream)
+        self._frame = None
+        while True:
+            try:
+                frame = next(self._frames)
+            except (StopIteration, av.error.FFmpegError):
+                self._position = index
+                return False
+            if self._index(frame) >= index:
+                break
+        # keep the reached frame to be returned by the next reading
+        self._frames = self._prepend(frame, self._frames)
+        self._position = index
+        return True
+    def keyframes(self):
+        '''
+        Decodes only the key frames from the current position, the decoder discards all other packets
+        returns:
+            generator of (frame index, timestamp in seconds, frame)
+        '''
+        self._stream.codec_context.skip_frame = "NONKEY"
+        try:
+            while self.grab():
+                index = self._position - 1
+                if self._frame.pts is not None:
+                    timestamp = float((self._frame.pts - self._start) * self._stream.time_base)
+                else:
+                    timestamp = index / self._rate if self._rate else 0.0
+                yield index, timestamp, self.retrieve()[1]
+        finally:
+            if self._stream is not None:
+                self._stream.codec_context.skip_frame = "DEFAULT"
+    def release(self):
+        '''
+        Closes the reader
+        '''
+        if self._container is not None:
+            self._container.close()
+        self._container = None
+        self._stream = None
+        self._frames = None
+        self._frame = None
+    def _index(self, frame):
+        '''
+        Gets the index of a decoded frame from its pts
+        '''
+        if frame.pts is None or not self._rate:
+            return self._position
+        return round((frame.pts - self._start) * self._stream.time_base * self._rate)
+    @staticmethod
+    def _prepend(frame, frames):
+        '''
+        Chains a frame before a frames generator
+        '''
+        yield frame
+        yield from frames
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
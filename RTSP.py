@@ -31,6 +31,7 @@ Copyright 2024 BaSSeM
 ## #############################################################################
 
 from xstream import cv2
+from xstream import _PyAV
 from xstream import _Stream
 
 ## #############################################################################
@@ -69,29 +70,36 @@ class RTSP(_Stream):
         self._specifications["frame-channels"] = None
     def __len__(self):
         return int(self._content.get(cv2.CAP_PROP_FRAME_COUNT))
-    def open(self, mode="r"):
+    def open(self, mode="r", pool=None, backend="opencv", format="bgr", threads=0):
         if mode not in ["r"]:
             raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        if backend not in ["opencv", "av"]:
+            raise ValueError(f"Not supported operation `open` for backend `{backend}` for stream source `{self._source}`")
         self._mode = mode
-        self._content = cv2.VideoCapture(str(self._source))
+        if backend in ["av"]:
+            # frames are decoded directly into the requested pixel format
+            self._content = self._acquire(lambda: _PyAV(self._source, format=format, threads=threads, options={"rtsp_transport": "tcp"}), pool, backend=backend, format=format, threads=threads)
+        else:
+            self._content = self._acquire(lambda: cv2.VideoCapture(str(self._source)), pool)
         self._specifications["frame-rate"] = self._content.get(cv2.CAP_PROP_FPS)
         self._specifications["frame-width"] = self._content.get(cv2.CAP_PROP_FRAME_WIDTH)
         self._specifications["frame-height"] = self._content.get(cv2.CAP_PROP_FRAME_HEIGHT)
         self._specifications["frame-channels"] = self._content.get(cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS)
+        self._negotiate(format, native=backend in ["av"])
         return self._content.isOpened()
     def close(self):
-        self._content.release()
-        self._content = None
+        self._release()
         return True
     def seek(self, index):
         return False
     def read(self):
         if self._mode not in ["r"]:
             raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
-        status, frame = self._content.read()
-        if not status:
-            frame = None
-        return frame
+        return self._retrieve()
+    def get(self, property):
+        if property in self._specifications:
+            return self._specifications[property]
+        return self._content.get(property)
     def write(self):
         if self._mode not in []:
             raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
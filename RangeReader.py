@@ -0,0 +1,238 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+RangeReader class exposes a remote file as a seekable binary file, fetching it
+chunk by chunk using HTTP Range requests over pooled connections and keeping
+the fetched chunks in a `ChunkCache`
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import io
+from xstream import http
+from xstream import Lock
+from xstream import urlsplit
+from xstream import _ChunkCache
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_connections = dict()   # idle keep-alive connections, (scheme, host) -> list of connections
+_lock = Lock()
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+def _acquire(scheme, netloc, timeout):
+    '''
+    Gets an idle pooled connection, or a new one if none is idle
+    '''
+    with _lock:
+        idle = _connections.get((scheme, netloc))
+        if idle:
+            return idle.pop()
+    connection = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    return connection(netloc, timeout=timeout)
+
+def _release(scheme, netloc, connection):
+    '''
+    Returns a connection to the pool for later reuse
+    '''
+    with _lock:
+        _connections.setdefault((scheme, netloc), []).append(connection)
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class RangeReader(io.BufferedIOBase):
+    '''
+    Seekable remote file reader
+    '''
+    def __init__(self, url, cache=None, timeout=10, probe=None):
+        '''
+        Initializes the reader, learning the remote file size and validators
+        args:
+            url: represents the http(s) link of the remote file
+            cache: represents the chunks cache (default = None: for the shared cache)
+            timeout: represents the connection timeout in seconds (default = 10)
+            probe: represents the status and lower-cased headers of a `Range: bytes=0-0` response already received for the link (default = None: for requesting it)
+        returns:
+            a reader instance, check `seekable` for the remote Range requests support
+        '''
+        super().__init__()
+        parts = urlsplit(url)
+        self._url = url
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._timeout = timeout
+        self._cache = cache if cache is not None else _ChunkCache.shared()
+        self._position = 0
+        self._length = None     # remote file size in bytes, None if Range requests are not supported
+        self._identity = None   # remote content identity, changes whenever the remote content does
+        self._index = None      # index of last read chunk
+        self._data = None       # bytes of last read chunk
+        self.fetched = 0        # number of chunks fetched from remote
+        self.cached = 0         # number of chunks served from the cache
+        if probe is not None:
+            status, headers = probe
+        else:
+            try:
+                status, headers, _ = self._request({"Range": "bytes=0-0"})
+            except (OSError, http.client.HTTPException):
+                return
+        total = headers.get("content-range", "").rpartition("/")[2]
+        if status == 206 and total.isdigit():
+            self._length = int(total)
+            validator = headers.get("etag") or headers.get("last-modified") or ""
+            # validators are only unique per resource, query strings of tagged contents are left out as signed links change on resolving
+            parts = urlsplit(self._url)
+            query = f"?{parts.query}" if parts.query and not headers.get("etag") else ""
+            self._identity = f"{parts.scheme}://{parts.netloc}{parts.path}{query}|{validator}|{self._length}"
+    def __len__(self):
+        return self._length or 0
+    def readable(self):
+        return True
+    def seekable(self):
+        return self._length is not None
+    def tell(self):
+        return self._position
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self)
+        if offset < 0:
+            raise ValueError(f"Not supported {self.__class__.__name__} operation `seek` for negative offset `{offset}` for source `{self._url}`")
+        self._position = offset
+        return self._position
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self) - self._position
+        data = bytearray(max(0, min(size, len(self) - self._position)))
+        count = self.readinto(data)
+        return bytes(data[:count])
+    def read1(self, size=-1):
+        return self.read(size)
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast("B")
+        count = 0
+        while count < len(view) and self._position < len(self):
+            index, offset = divmod(self._position, self._cache.chunk)
+            chunk = self._chunk(index)
+            size = min(len(view) - count, len(chunk) - offset)
+            view[count:count + size] = memoryview(chunk)[offset:offset + size]
+            count += size
+            self._position += size
+        view.release()
+        return count
+    def _chunk(self, index):
+        '''
+        Gets a chunk from the last read chunk, the cache, or the remote file in order
+        args:
+            index: represents the chunk index within the remote file
+        returns:
+            chunk bytes
+        '''
+        if index == self._index:
+            return self._data
+        data = self._cache.get(self._identity, index)
+        if data is None:
+            start = index * self._cache.chunk
+            end = min(start + self._cache.chunk, len(self)) - 1
+            status, _, data = self._request({"Range": f"bytes={start}-{end}"}, body=True)
+            if status != 206 or len(data) != end - start + 1:
+                raise OSError(f"Couldn't complete operation `read` for range `{start}-{end}` for source `{self._url}`")
+            self._cache.put(self._identity, index, data)
+            self.fetched += 1
+        else:
+            self.cached += 1
+        self._index, self._data = index, data
+        return data
+    def _request(self, headers, body=False):
+        '''
+        Sends a GET request over a pooled connection, retrying once on a stale connection
+        args:
+            headers: represents the request headers
+            body: represents whether to read the response body (default = False: for dropping the connection)
+        returns:
+            status, lower-cased response headers, response body
+        '''
+        for attempt in range(2):
+            connection = _acquire(self._scheme, self._netloc, self._timeout)
+            try:
+                connection.request("GET", self._target, headers=headers)
+                response = connection.getresponse()
+                data = response.read() if body else None
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                if attempt > 0:
+                    raise
+                continue
+            if body and not response.will_close:
+                _release(self._scheme, self._netloc, connection)
+            else:
+                connection.close()
+            return response.status, {key.lower(): value for key, value in response.getheaders()}, data
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
@@ -0,0 +1,252 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Resolver class resolves page links (ex: youtube) into media links, caching the
+resolved links until they expire so reconnects and sibling streams skip the
+slow resolution round-trips
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import os
+from xstream import json
+from xstream import time
+from xstream import pafy
+from xstream import Path
+from xstream import Lock
+from xstream import Future
+from xstream import ThreadPoolExecutor
+from xstream import urlsplit
+from xstream import parse_qs
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_pafy_hosts = ["youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be"]
+_expiry_margin = 60 # seconds before a media link announced expiry at which it is no longer handed out
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+def _pafy_resolve(source):
+    '''
+    Resolves a page link into its best mp4 media link using `pafy`, other links are considered media links already
+    args:
+        source: represents the page link to be resolved
+    returns:
+        the media link
+    '''
+    if urlsplit(str(source)).hostname not in _pafy_hosts:
+        return str(source)
+    return pafy.new(str(source)).getbest(preftype="mp4").url
+
+def _expiry(url, ttl):
+    '''
+    Gets the time at which a resolved media link shall be considered stale
+    args:
+        url: represents the resolved media link, may announce its own expiry using `expire` query (ex: googlevideo)
+        ttl: represents the maximum time-to-live in seconds
+    returns:
+        expiry time in seconds since epoch
+    '''
+    expiry = time.time() + ttl
+    announced = parse_qs(urlsplit(url).query).get("expire")
+    if announced and announced[0].isdigit():
+        expiry = min(expiry, int(announced[0]) - _expiry_margin)
+    return expiry
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Resolver:
+    '''
+    Caching media links resolver
+    '''
+    _shared = None
+    def __init__(self, resolver=None, ttl=3600, path=None, workers=8):
+        '''
+        Initializes the resolver
+        args:
+            resolver: represents a callable resolving a page link into a media link (default = None: for `pafy` best mp4)
+            ttl: represents the maximum time-to-live in seconds of a resolved media link (default = 3600)
+            path: represents a json file path to persist resolved media links into (default = None: for memory only)
+            workers: represents the number of concurrent resolutions used by `resolve_many` (default = 8)
+        returns:
+            a resolver instance
+        '''
+        self._resolver = resolver if resolver is not None else _pafy_resolve
+        self._ttl = ttl
+        self._path = Path(path) if path is not None else None
+        self._workers = workers
+        self._lock = Lock()
+        self._entries = dict()  # resolved media links, page link -> (media link, expiry)
+        self._pending = dict()  # in-flight resolutions, page link -> future
+        self._load()
+    @classmethod
+    def shared(cls):
+        '''
+        Gets the resolver shared among all streams
+        returns:
+            the shared resolver instance
+        '''
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    @classmethod
+    def share(cls, resolver):
+        '''
+        Sets the resolver shared among all streams
+        args:
+            resolver: represents the resolver instance to be shared
+        returns:
+            the shared resolver instance
+        '''
+        cls._shared = resolver
+        return cls._shared
+    def resolve(self, source):
+        '''
+        Resolves a page link into a media link, reusing a cached one if still valid
+        args:
+            source: represents the page link to be resolved
+        returns:
+            the media link
+        '''
+        source = str(source)
+        with self._lock:
+            entry = self._entries.get(source)
+            if entry is not None and entry[1] > time.time():
+                return entry[0]
+            future = self._pending.get(source)
+            owner = future is None
+            if owner:
+                future = self._pending[source] = Future()
+        if not owner:
+            return future.result()
+        try:
+            url = self._resolver(source)
+            expiry = _expiry(url, self._ttl)
+        except BaseException as error:
+            with self._lock:
+                self._pending.pop(source, None)
+            future.set_exception(error)
+            raise
+        with self._lock:
+            self._entries[source] = (url, expiry)
+            self._pending.pop(source, None)
+        # waiting callers are answered before persisting, which may fail
+        future.set_result(url)
+        with self._lock:
+            self._save()
+        return url
+    def resolve_many(self, sources, workers=None):
+        '''
+        Resolves many page links concurrently
+        args:
+            sources: represents the page links to be resolved
+            workers: represents the number of concurrent resolutions (default = None: for the resolver `workers`)
+        returns:
+            list of media links ordered as the page links
+        '''
+        sources = list(sources)
+        workers = workers if workers is not None else self._workers
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources)))) as executor:
+            return list(executor.map(self.resolve, sources))
+    def invalidate(self, source=None):
+        '''
+        Drops cached media links, ex: when a media link is refused before its announced expiry
+        args:
+            source: represents the page link to be dropped (default = None: for all page links)
+        '''
+        with self._lock:
+            if source is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(source), None)
+            self._save()
+    def _load(self):
+        '''
+        Loads the non-expired persisted media links
+        '''
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            entries = json.loads(self._path.read_text())
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        self._entries.update({source: (url, expiry) for source, (url, expiry) in entries.items() if expiry > now})
+    def _save(self):
+        '''
+        Persists the media links, failures are ignored, caller MUST hold the resolver lock
+        '''
+        if self._path is None:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps(self._entries))
+            os.replace(temporary, self._path)
+        except (OSError, TypeError, ValueError):
+            pass # media links are kept in memory only, ex: disk full, unserializable link
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
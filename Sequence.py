@@ -0,0 +1,204 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Sequence class writes frames into numbered image files, `out/frame_%06d.jpg`
+sources, encoding and writing them on a thread pool with a bounded number of
+frames in flight, with tunable JPEG quality and PNG compression, reporting
+the files and bytes written
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import time
+from xstream import Path
+from xstream import Lock
+from xstream import deque
+from xstream import ThreadPoolExecutor
+from xstream import wait, FIRST_COMPLETED
+from xstream import _Governor
+from xstream import _Stream
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Sequence(_Stream):
+    def __init__(self, source):
+        super().__init__(source)
+        if not isinstance(self._source, (str, Path)):
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source-type `{type(self._source)}`")
+        try:
+            str(self._source) % 0
+        except (TypeError, ValueError):
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source `{self._source}`, expected a single integer field, ex: `frame_%06d.jpg`")
+        extension = Path(self._source).suffix[1:].lower()
+        if extension not in ["jpg", "jpeg", "jpe", "bmp", "png", "pbm", "pgm", "ppm", "pxm", "pnm", "webp"]:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source `{self._source}` with extension `{extension}`")
+        self._type = "Media/Sequence"
+        self._extension = extension
+        self._parameters = []
+        self._executor = None
+        self._pending = deque()     # encodings in flight, ordered as written
+        self._inflight = None
+        self._governor = None
+        self._lock = Lock()
+        self._index = 0             # index of next written file
+        self._start = None          # time of the first written frame, `time.perf_counter` clock, for the files per second rate
+        self._specifications["frame-width"] = None
+        self._specifications["frame-height"] = None
+        self._specifications["frame-channels"] = None
+        self._specifications["files-written"] = 0
+        self._specifications["bytes-written"] = 0
+        self._specifications["write-rate"] = None
+    def __len__(self):
+        return self._index
+    def open(self, mode="w", quality=95, compression=3, workers=4, inflight=None, start=0, governor=None):
+        if mode not in ["w"]:
+            raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        self._mode = mode
+        if self._extension in ["jpg", "jpeg", "jpe"]:
+            self._parameters = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        elif self._extension in ["webp"]:
+            self._parameters = [cv2.IMWRITE_WEBP_QUALITY, quality]
+        elif self._extension in ["png"]:
+            self._parameters = [cv2.IMWRITE_PNG_COMPRESSION, compression]
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        # frames are referenced until written, in flight frames bound the memory held
+        self._inflight = max(1, inflight or 2 * workers)
+        self._governor = governor if governor is not None else _Governor.shared()
+        self._index = start
+        Path(self._source).parent.mkdir(parents=True, exist_ok=True)
+        return True
+    def close(self):
+        try:
+            self._collect(0)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+        return True
+    def tell(self):
+        return self._index
+    def seek(self, index):
+        return False
+    def write(self, frame):
+        if self._mode not in ["w"]:
+            raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
+        self._collect(self._inflight - 1)
+        if self._start is None:
+            self._start = time.perf_counter()
+        self._specifications["frame-width"] = frame.shape[1]
+        self._specifications["frame-height"] = frame.shape[0]
+        self._specifications["frame-channels"] = frame.shape[2] if len(frame.shape) > 2 else 1
+        # frames are copied as sources may reuse their buffers before encoded, ex: shared memory rings, decoding buffers
+        frame = cv2.numpy.array(frame)
+        # written frames are never dropped nor downscaled, they wait for the governed memory whatever the policy
+        size = frame.nbytes
+        self._governor.charge(self._source, size, timeout=None)
+        future = self._executor.submit(self._encode, Path(str(self._source) % self._index), frame)
+        future.add_done_callback(lambda _: self._governor.release(self._source, size))
+        self._pending.append(future)
+        self._index += 1
+        return True
+    def write_many(self, frames):
+        count = 0
+        for frame in frames:
+            self.write(frame)
+            count += 1
+        return count
+    def get(self, property):
+        if property in self._specifications:
+            return self._specifications[property]
+        return None
+    def _encode(self, path, frame):
+        '''
+        Encodes a frame and writes it into its file, runs on the pool
+        '''
+        status, data = cv2.imencode(f".{self._extension}", cv2.numpy.asarray(frame), self._parameters)
+        if not status:
+            raise RuntimeWarning(f"Couldn't complete operation `write` for mode `{self._mode}` for stream source `{path}`")
+        with open(path, "wb") as file:
+            file.write(data)
+        with self._lock:
+            self._specifications["files-written"] += 1
+            self._specifications["bytes-written"] += data.nbytes
+            elapsed = time.perf_counter() - self._start
+            self._specifications["write-rate"] = self._specifications["files-written"] / elapsed if elapsed > 0 else None
+    def _collect(self, limit):
+        '''
+        Waits for encodings in flight until at most `limit` remain, raising the first failure
+        '''
+        while len(self._pending) > limit:
+            done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._pending.remove(future)
+            for future in done:
+                future.result()
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
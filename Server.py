@@ -0,0 +1,323 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Server class re-streams a stream as MJPEG over HTTP to many viewers, every
+frame is JPEG encoded once and fanned out over asyncio, each viewer only keeps
+the latest frame not sent yet so slow viewers skip frames without delaying the
+others, encoding, viewers and per viewer drops statistics are exposed
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import json
+from xstream import socket
+from xstream import asyncio
+from xstream import Thread, Lock, Event
+from xstream import urlsplit
+from xstream import _Governor
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+class _viewer:
+    '''
+    Connected viewer state, only touched from the server event loop
+    '''
+    def __init__(self, address):
+        self.address = address
+        self.frame = None           # latest encoded frame not sent yet
+        self.sending = None         # encoded frame being sent
+        self.event = asyncio.Event()
+        self.sent = 0               # number of frames sent
+        self.dropped = 0            # number of frames replaced before being sent
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_boundary = b"frame"
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Server:
+    '''
+    Encode once MJPEG over HTTP server
+    '''
+    def __init__(self, stream, host="127.0.0.1", port=8080, quality=80, buffer=1<<18, governor=None):
+        '''
+        Initializes the server, serving the frames stream on `/` and the statistics as JSON on `/stats`
+        args:
+            stream: represents the opened stream from which to serve frames
+            host: represents the address to listen on (default = '127.0.0.1': for local viewers only)
+            port: represents the port to listen on (default = 8080, 0: for any free port)
+            quality: represents the JPEG quality, from 0 to 100 (default = 80)
+            buffer: represents the socket send buffer size in bytes per viewer, bounding the stale frames queued to slow viewers (default = 256 KiB)
+            governor: represents the memory governor accounting the frames held per viewer, viewers over the limits skip frames whatever the policy (default = None: for the shared governor)
+        returns:
+            a server instance
+        '''
+        self._stream = stream
+        self._host = host
+        self._port = port
+        self._quality = quality
+        self._buffer = buffer
+        self._loop = None
+        self._server = None
+        self._threads = []
+        self._started = Event()
+        self._stopped = Event()
+        self._error = None
+        self._viewers = set()
+        self._lock = Lock()     # guards viewers changes made on the event loop against statistics read from other threads
+        self._governor = governor if governor is not None else _Governor.shared()
+        self._owner = str(getattr(stream, "_stream", stream)._source) # governed source
+        self._latest = None     # latest encoded frame, sent first to new viewers
+        self.frames = 0         # number of frames read from the stream
+        self.encoded = 0        # number of frames encoded, once per frame read while viewers are connected
+        self.sent = 0           # number of frames sent by disconnected viewers
+        self.dropped = 0        # number of frames dropped by disconnected viewers
+    @property
+    def port(self):
+        '''
+        Gets the port listened on, once started
+        '''
+        return self._port
+    @property
+    def viewers(self):
+        '''
+        Gets the number of connected viewers
+        '''
+        return len(self._viewers)
+    def stats(self):
+        '''
+        Gets the server statistics
+        returns:
+            dictionary of frames read and encoded, connected viewers, and frames sent and dropped in total and per connected viewer
+        '''
+        with self._lock:
+            viewers = {viewer.address: {"sent": viewer.sent, "dropped": viewer.dropped} for viewer in self._viewers}
+            sent, dropped = self.sent, self.dropped
+        return {
+            "frames": self.frames,
+            "encoded": self.encoded,
+            "viewers": len(viewers),
+            "sent": sent + sum(viewer["sent"] for viewer in viewers.values()),
+            "dropped": dropped + sum(viewer["dropped"] for viewer in viewers.values()),
+            "per-viewer": viewers,
+            }
+    def start(self):
+        '''
+        Starts listening and serving frames in background until the stream ends or `stop` is called
+        returns:
+            the server instance
+        '''
+        self._stopped.clear()
+        self._started.clear()
+        self._threads = [Thread(target=self._serve, name=f"Server {self._host}:{self._port}", daemon=True)]
+        self._threads[0].start()
+        self._started.wait()
+        if self._error is not None:
+            self._threads[0].join()
+            raise self._error
+        self._threads.append(Thread(target=self.run, name=f"Server {self._host}:{self._port} reader", daemon=True))
+        self._threads[1].start()
+        return self
+    def stop(self):
+        '''
+        Stops serving, disconnecting all viewers
+        returns:
+            True on success, False otherwise
+        '''
+        self._stopped.set()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        return True
+    def run(self):
+        '''
+        Reads and encodes frames until the stream ends or `stop` is called, frames read without viewers are not encoded
+        '''
+        loop = self._loop
+        for frame in self._stream:
+            if self._stopped.is_set():
+                break
+            self.frames += 1
+            if not self._viewers:
+                continue
+            status, jpeg = cv2.imencode(".jpg", cv2.numpy.asarray(frame), [cv2.IMWRITE_JPEG_QUALITY, self._quality])
+            if not status:
+                continue
+            self.encoded += 1
+            try:
+                loop.call_soon_threadsafe(self._publish, jpeg.tobytes())
+            except RuntimeError:
+                break # event loop closed by `stop`
+    def _serve(self):
+        '''
+        Runs the event loop accepting viewers until `stop` is called
+        '''
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(asyncio.start_server(self._handle, self._host, self._port))
+        except OSError as error:
+            self._error = error
+            loop.close()
+            self._started.set()
+            return
+        self._port = self._server.sockets[0].getsockname()[1]
+        self._loop = loop
+        self._started.set()
+        loop.run_forever()
+        # viewers are disconnected before the listening socket is closed
+        self._server.close()
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(self._server.wait_closed())
+        loop.close()
+        self._loop = None
+        self._server = None
+    def _publish(self, jpeg):
+        '''
+        Hands an encoded frame to every viewer, replacing the frame not sent yet if any
+        '''
+        self._latest = jpeg
+        for viewer in self._viewers:
+            if viewer.frame is not None:
+                viewer.dropped += 1
+            self._hold(viewer, jpeg)
+    def _hold(self, viewer, jpeg):
+        '''
+        Replaces the frame not sent yet of a viewer within the governed memory, the event loop never waits for it, caller MUST run on the event loop
+        '''
+        if viewer.frame is not None:
+            self._governor.release(self._owner, len(viewer.frame))
+        viewer.frame = None
+        if jpeg is None:
+            return
+        if not self._governor.charge(self._owner, len(jpeg)):
+            viewer.dropped += 1 # skipped, as for a slow viewer
+            return
+        viewer.frame = jpeg
+        viewer.event.set()
+    async def _handle(self, reader, writer):
+        '''
+        Serves a viewer connection
+        '''
+        viewer = None
+        try:
+            request = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()) not in [b"\r\n", b"\n", b""]:
+                pass # request headers are ignored
+            path = urlsplit(request[1]).path if len(request) > 1 else "/"
+            if path in ["/stats"]:
+                body = json.dumps(self.stats()).encode()
+                writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+                await writer.drain()
+                return
+            if path not in ["/"]:
+                writer.write(b"HTTP/1.0 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+                return
+            writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: multipart/x-mixed-replace; boundary=" + _boundary + b"\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n")
+            connection = writer.get_extra_info("socket")
+            if connection is not None and self._buffer:
+                # frames left in kernel buffers are not replaced by newer ones
+                connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self._buffer)
+            address = writer.get_extra_info("peername")
+            viewer = _viewer(f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address))
+            self._hold(viewer, self._latest)
+            with self._lock:
+                self._viewers.add(viewer)
+            while True:
+                await viewer.event.wait()
+                viewer.event.clear()
+                jpeg = viewer.sending = viewer.frame
+                viewer.frame = None
+                # the encoded frame is shared by all viewers, never copied
+                writer.writelines([b"--" + _boundary + b"\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n" % len(jpeg), jpeg, b"\r\n"])
+                await writer.drain()
+                viewer.sending = None
+                self._governor.release(self._owner, len(jpeg))
+                viewer.sent += 1
+        except (OSError, UnicodeError):
+            pass # viewer disconnected
+        except asyncio.CancelledError:
+            pass # server stopped, viewer handling ends quietly
+        finally:
+            if viewer is not None:
+                with self._lock:
+                    self._viewers.discard(viewer)
+                    self.sent += viewer.sent
+                    self.dropped += viewer.dropped
+                self._hold(viewer, None)
+                if viewer.sending is not None:
+                    self._governor.release(self._owner, len(viewer.sending))
+            writer.close()
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
@@ -0,0 +1,335 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Publisher class decodes a stream once into a named shared memory ring of frame
+slots, Shared class attaches to that ring from any local process as a stream
+source `shm://<name>` reading zero-copy views of the published frames
+
+Ring layout, all fields are 64-bit:
+    header : magic, slots, height, width, channels, head sequence, closed flag, dtype
+    stamps : per slot sequence, -1 while being written
+    indices: per slot frame index
+    times  : per slot monotonic capture time
+    frames : per slot frame pixels
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import time
+from xstream import Thread
+from xstream import Event
+from xstream import shared_memory
+from xstream import resource_tracker
+from xstream import _Stream
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+class _ring:
+    '''
+    Shared memory ring views
+    '''
+    def __init__(self, memory):
+        '''
+        Initializes the ring views over a shared memory block which header is already filled
+        args:
+            memory: represents the shared memory block
+        returns:
+            ring views
+        '''
+        numpy = cv2.numpy
+        self.memory = memory
+        self.header = numpy.ndarray((_header_size,), dtype=numpy.int64, buffer=memory.buf)
+        if self.header[_magic] != _magic_value:
+            raise RuntimeError(f"Not supported shared memory `{memory.name}` layout")
+        self.slots = int(self.header[_slots])
+        self.shape = tuple(int(size) for size in self.header[_height:_channels + 1] if size > 0)
+        self.dtype = numpy.dtype(self.header[_dtype:_dtype + 1].tobytes().rstrip(b"\0").decode())
+        offset = self.header.nbytes
+        self.stamps = numpy.ndarray((self.slots,), dtype=numpy.int64, buffer=memory.buf, offset=offset)
+        offset += self.stamps.nbytes
+        self.indices = numpy.ndarray((self.slots,), dtype=numpy.int64, buffer=memory.buf, offset=offset)
+        offset += self.indices.nbytes
+        self.times = numpy.ndarray((self.slots,), dtype=numpy.float64, buffer=memory.buf, offset=offset)
+        offset += self.times.nbytes
+        self.offset = _align(offset)
+        self.size = _align(int(numpy.prod(self.shape)) * self.dtype.itemsize)
+    def frame(self, slot):
+        '''
+        Gets a zero-copy view of a slot frame
+        '''
+        return cv2.numpy.ndarray(self.shape, dtype=self.dtype, buffer=self.memory.buf, offset=self.offset + slot * self.size)
+    def release(self):
+        '''
+        Drops the views, required before closing the shared memory block
+        '''
+        self.header = self.stamps = self.indices = self.times = None
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_magic, _slots, _height, _width, _channels, _head, _closed, _dtype = range(8)
+_header_size = 8
+_magic_value = 0x58535452454D31 # "XSTREM1"
+_alignment = 64
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+def _align(size):
+    '''
+    Rounds a size up to the ring alignment
+    '''
+    return (size + _alignment - 1) // _alignment * _alignment
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Publisher:
+    '''
+    Shared memory ring frames publisher
+    '''
+    def __init__(self, stream, name, slots=8):
+        '''
+        Initializes the publisher, the ring is created on the first published frame
+        args:
+            stream: represents the opened stream from which to publish frames
+            name: represents the shared memory ring name
+            slots: represents the number of frames kept in the ring (default = 8)
+        returns:
+            a publisher instance
+        '''
+        self._stream = stream
+        self._name = name
+        self._slots = slots
+        self._ring = None
+        self._thread = None
+        self._stopped = Event()
+        self.published = 0  # number of published frames
+    def start(self):
+        '''
+        Starts publishing frames in background until the stream ends or `stop` is called
+        returns:
+            the publisher instance
+        '''
+        self._stopped.clear()
+        self._thread = Thread(target=self.run, name=f"Publisher {self._name}", daemon=True)
+        self._thread.start()
+        return self
+    def stop(self):
+        '''
+        Stops background publishing and closes the ring
+        returns:
+            True on success, False otherwise
+        '''
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.close()
+    def run(self):
+        '''
+        Publishes frames until the stream ends or `stop` is called
+        '''
+        for frame in self._stream:
+            if self._stopped.is_set():
+                break
+            self.publish(frame)
+        if self._ring is not None:
+            self._ring.header[_closed] = 1
+    def publish(self, frame):
+        '''
+        Publishes a frame into the next ring slot, never waiting for subscribers
+        args:
+            frame: represents the frame to be published
+        returns:
+            the published frame sequence
+        '''
+        if self._ring is None:
+            self._create(frame)
+        if frame.shape != self._ring.shape or frame.dtype != self._ring.dtype:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} operation `publish` for frame `{frame.shape}` `{frame.dtype}` into ring `{self._name}` of `{self._ring.shape}` `{self._ring.dtype}`")
+        sequence = self.published + 1
+        slot = (sequence - 1) % self._ring.slots
+        self._ring.stamps[slot] = -1
+        self._ring.frame(slot)[...] = frame
+        self._ring.indices[slot] = self.published
+        self._ring.times[slot] = time.monotonic()
+        self._ring.stamps[slot] = sequence
+        self._ring.header[_head] = sequence
+        self.published = sequence
+        return sequence
+    def close(self):
+        '''
+        Marks the ring closed for subscribers and removes it
+        returns:
+            True on success, False otherwise
+        '''
+        if self._ring is None:
+            return True
+        memory = self._ring.memory
+        self._ring.header[_closed] = 1
+        self._ring.release()
+        self._ring = None
+        memory.close()
+        memory.unlink()
+        return True
+    def _create(self, frame):
+        '''
+        Creates the ring fitting the frame shape and type
+        '''
+        numpy = cv2.numpy
+        shape = tuple(frame.shape) + (0,) * (3 - len(frame.shape))
+        size = _align((_header_size + 3 * self._slots) * 8) + self._slots * _align(frame.nbytes)
+        memory = shared_memory.SharedMemory(name=self._name, create=True, size=size)
+        header = numpy.ndarray((_header_size,), dtype=numpy.int64, buffer=memory.buf)
+        header[:] = 0
+        header[_magic] = _magic_value
+        header[_slots] = self._slots
+        header[_height:_channels + 1] = shape
+        header[_dtype:_dtype + 1] = numpy.frombuffer(frame.dtype.str.encode().ljust(8, b"\0"), dtype=numpy.int64)
+        del header
+        self._ring = _ring(memory)
+        self._ring.stamps[:] = 0
+
+class Shared(_Stream):
+    def __init__(self, source):
+        super().__init__(source)
+        if not isinstance(self._source, str) or self._source.find(f"shm://", 0, len(f"shm://")) == -1:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source-type `{type(self._source)}`")
+        self._type = "Shared"
+        self._specifications["frame-width"] = None
+        self._specifications["frame-height"] = None
+        self._specifications["frame-channels"] = None
+        self._sequence = 0  # sequence of the next frame to be read
+        self._index = None  # index of the last read frame
+        self._copy = False
+        self._timeout = None
+        self.dropped = 0    # number of frames skipped for lagging behind the publisher
+    def __len__(self):
+        return cv2.numpy.inf
+    def open(self, mode="r", copy=False, timeout=None):
+        if mode not in ["r"]:
+            raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        self._mode = mode
+        self._copy = copy
+        self._timeout = timeout
+        # attaching process MUST NOT remove the ring on exit, it is owned by the publisher
+        try:
+            memory = shared_memory.SharedMemory(name=self._source[len("shm://"):], track=False)
+        except TypeError:
+            # python < 3.13 always tracks attached shared memory
+            try:
+                memory = shared_memory.SharedMemory(name=self._source[len("shm://"):])
+            except FileNotFoundError:
+                return False
+            resource_tracker.unregister(memory._name, "shared_memory")
+        except FileNotFoundError:
+            return False
+        self._content = _ring(memory)
+        self._sequence = max(1, int(self._content.header[_head]))
+        self._specifications["frame-height"] = self._content.shape[0]
+        self._specifications["frame-width"] = self._content.shape[1]
+        self._specifications["frame-channels"] = self._content.shape[2] if len(self._content.shape) > 2 else 1
+        return True
+    def close(self):
+        memory = self._content.memory
+        self._content.release()
+        self._content = None
+        memory.close()
+        return True
+    def tell(self):
+        return self._index
+    def seek(self, index):
+        return False
+    def read(self):
+        if self._mode not in ["r"]:
+            raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
+        ring = self._content
+        delay, waited = 0.0001, 0
+        while True:
+            head = int(ring.header[_head])
+            if head >= self._sequence:
+                if head - self._sequence >= ring.slots - 1:
+                    # lagging reader skips to the latest frame rather than reading a slot being overwritten
+                    self.dropped += head - self._sequence
+                    self._sequence = head
+                slot = (self._sequence - 1) % ring.slots
+                frame = ring.frame(slot)
+                if self._copy:
+                    frame = frame.copy()
+                index = int(ring.indices[slot])
+                if int(ring.stamps[slot]) == self._sequence:
+                    self._index = index
+                    self._sequence += 1
+                    return self._record(frame, index, float(ring.times[slot]))
+                continue # slot overwritten while reading
+            if ring.header[_closed] or (self._timeout is not None and waited >= self._timeout):
+                return None
+            time.sleep(delay)
+            waited += delay
+            delay = min(delay * 2, 0.005)
+    def write(self):
+        if self._mode not in []:
+            raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
+        return False
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
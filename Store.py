@@ -0,0 +1,364 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Store class keeps decoded, optionally downscaled, video frames on disk as chunks
+of memory-mapped numpy arrays, a first sequential reading pass fills the store,
+later readings are served as zero-copy views without decoding, entries are
+keyed by source path, size and modification time and evicted least recently
+used first
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import os
+from xstream import cv2
+from xstream import json
+from xstream import shutil
+from xstream import hashlib
+from xstream import Path
+from xstream import Lock
+from xstream import OrderedDict
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+class _reader:
+    '''
+    Stored frames reader, mimics the `cv2.VideoCapture` reading interface
+    '''
+    def __init__(self, directory, meta):
+        self._directory = directory
+        self._meta = meta
+        self._chunks = dict()   # opened chunks, chunk index -> memory-mapped array
+        self._position = 0      # index of next frame to be read
+        self._frame = None      # grabbed frame
+    def isOpened(self):
+        return self._meta is not None
+    def grab(self):
+        status, self._frame = self.read()
+        return status
+    def retrieve(self, image=None):
+        return self._frame is not None, self._frame
+    def read(self, image=None):
+        if self._meta is None or self._position >= self._meta["frame-count"]:
+            return False, None
+        chunk, offset = divmod(self._position, self._meta["chunk"])
+        if chunk not in self._chunks:
+            self._chunks[chunk] = cv2.numpy.load(self._directory / f"{chunk:06d}.npy", mmap_mode="r")
+        self._position += 1
+        return True, self._chunks[chunk][offset]
+    def get(self, property):
+        if self._meta is None:
+            return 0
+        rate = self._meta["frame-rate"]
+        return {
+            cv2.CAP_PROP_FPS: rate,
+            cv2.CAP_PROP_FRAME_COUNT: self._meta["frame-count"],
+            cv2.CAP_PROP_FRAME_WIDTH: self._meta["frame-width"],
+            cv2.CAP_PROP_FRAME_HEIGHT: self._meta["frame-height"],
+            cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS: self._meta["frame-channels"],
+            cv2.CAP_PROP_POS_FRAMES: self._position,
+            cv2.CAP_PROP_POS_MSEC: 1000 * self._position / rate if rate else 0,
+            }.get(property, 0)
+    def set(self, property, value):
+        if property != cv2.CAP_PROP_POS_FRAMES or self._meta is None or not 0 <= int(value) <= self._meta["frame-count"]:
+            return False
+        self._position = int(value)
+        return True
+    def release(self):
+        self._chunks.clear()
+        self._meta = None
+
+class _writer:
+    '''
+    Capture proxy storing frames read sequentially from the first one, mimics the `cv2.VideoCapture` reading interface
+    '''
+    def __init__(self, store, directory, capture, count):
+        self._store = store
+        self._directory = directory
+        self._capture = capture
+        self._count = count     # number of frames to be stored for the store entry to be complete
+        self._chunk = None      # memory-mapped array of the chunk being written
+        self._written = 0       # number of frames stored, in order
+        self._position = 0      # index of next frame to be read
+        self._frame = None      # grabbed frame
+    def isOpened(self):
+        return self._capture.isOpened()
+    def grab(self):
+        status, self._frame = self.read()
+        return status
+    def retrieve(self, image=None):
+        return self._frame is not None, self._frame
+    def read(self, image=None):
+        status, frame = self._capture.read()
+        if not status:
+            return False, None
+        if self._store._size is not None:
+            frame = cv2.resize(frame, self._store._size, interpolation=cv2.INTER_AREA)
+        if self._position == self._written < self._count:
+            self._put(frame)
+        self._position += 1
+        return True, frame
+    def get(self, property):
+        if self._store._size is not None and property in [cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT]:
+            return self._store._size[0 if property == cv2.CAP_PROP_FRAME_WIDTH else 1]
+        return self._capture.get(property)
+    def set(self, property, value):
+        status = self._capture.set(property, value)
+        if status and property == cv2.CAP_PROP_POS_FRAMES:
+            self._position = int(value)
+        return status
+    def release(self):
+        self._capture.release()
+        if self._chunk is not None:
+            self._chunk.flush()
+            self._chunk = None
+        if self._written == self._count and self._count > 0:
+            self._store._commit(self._directory, self._meta)
+        else:
+            shutil.rmtree(self._directory, ignore_errors=True) # incomplete pass, ex: stopped early or seeking
+    def _put(self, frame):
+        '''
+        Stores the next frame, creating its chunk on demand
+        '''
+        chunk, offset = divmod(self._written, self._store._chunk)
+        if offset == 0:
+            if self._chunk is not None:
+                self._chunk.flush()
+            else:
+                self._directory.mkdir(parents=True, exist_ok=True)
+                self._meta = {
+                    "frame-rate": self._capture.get(cv2.CAP_PROP_FPS),
+                    "frame-count": self._count,
+                    "frame-width": frame.shape[1],
+                    "frame-height": frame.shape[0],
+                    "frame-channels": frame.shape[2] if len(frame.shape) > 2 else 1,
+                    "chunk": self._store._chunk,
+                    }
+            length = min(self._store._chunk, self._count - self._written)
+            self._chunk = cv2.numpy.lib.format.open_memmap(self._directory / f"{chunk:06d}.npy", mode="w+", dtype=frame.dtype, shape=(length, *frame.shape))
+        self._chunk[offset] = frame
+        self._written += 1
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Store:
+    '''
+    On-disk memory-mapped decoded frames store, stored frames are read-only memory-mapped arrays, copy them before modifying them in place
+    '''
+    _shared = None
+    def __init__(self, root=None, limit=8<<30, chunk=256, size=None):
+        '''
+        Initializes the store, indexing the entries already on disk
+        args:
+            root: represents the directory to store frames into (default = None: for `~/.cache/xstream/frames`)
+            limit: represents the maximum total size in bytes of stored frames (default = 8 GiB)
+            chunk: represents the number of frames per memory-mapped file (default = 256)
+            size: represents the stored frames size (width, height), frames are downscaled on storing (default = None: for decoded size)
+        returns:
+            a store instance
+        '''
+        self._root = Path(root) if root is not None else Path.home() / ".cache" / "xstream" / "frames"
+        self._limit = limit
+        self._chunk = chunk
+        self._size = tuple(size) if size is not None else None
+        self._lock = Lock()
+        self._entries = OrderedDict()   # complete entries, directory -> size, least recently used first
+        self._total = 0                 # total size in bytes of stored frames
+        self._root.mkdir(parents=True, exist_ok=True)
+        stored = [(path, path.stat()) for path in self._root.glob("*/meta.json")]
+        for path, status in sorted(stored, key=lambda entry: entry[1].st_mtime):
+            size = sum(chunk.stat().st_size for chunk in path.parent.glob("*.npy"))
+            self._entries[path.parent] = size
+            self._total += size
+    @classmethod
+    def shared(cls):
+        '''
+        Gets the store shared among all streams
+        returns:
+            the shared store instance
+        '''
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    @classmethod
+    def share(cls, store):
+        '''
+        Sets the store shared among all streams
+        args:
+            store: represents the store instance to be shared
+        returns:
+            the shared store instance
+        '''
+        cls._shared = store
+        return cls._shared
+    @property
+    def size(self):
+        '''
+        Gets the total size in bytes of stored frames
+        '''
+        return self._total
+    def reader(self, source, variant="bgr"):
+        '''
+        Gets a reader of the stored frames of a source
+        args:
+            source: represents the video file path
+            variant: represents the stored frames pixel format (default = 'bgr')
+        returns:
+            a reader, mimicking `cv2.VideoCapture` with read-only frames, if the source frames are stored, None otherwise
+        '''
+        directory = self._directory(source, variant)
+        if directory is None:
+            return None
+        try:
+            meta = json.loads((directory / "meta.json").read_text())
+            os.utime(directory / "meta.json")
+        except (OSError, ValueError):
+            return None
+        # entries committed by other processes or stores since indexing are adopted
+        if not self._adopt(directory, meta):
+            return None
+        return _reader(directory, meta)
+    def writer(self, source, capture, count, variant="bgr"):
+        '''
+        Wraps a capture so its frames, read sequentially from the first one, are stored
+        args:
+            source: represents the video file path
+            capture: represents the opened capture of the source
+            count: represents the number of frames of the source
+            variant: represents the capture frames pixel format (default = 'bgr')
+        returns:
+            a capture proxy, mimicking `cv2.VideoCapture`, storing the read frames
+        '''
+        directory = self._directory(source, variant)
+        if directory is None or not count:
+            return capture
+        # written aside, then renamed once complete
+        return _writer(self, directory.with_name(f"{directory.name}.{os.getpid()}.{id(capture)}.tmp"), capture, int(count))
+    def _directory(self, source, variant):
+        '''
+        Gets the directory of the stored frames of a source, keyed by its path, size, modification time and the stored frames layout
+        '''
+        path = Path(source).resolve()
+        try:
+            status = path.stat()
+        except OSError:
+            return None
+        digest = hashlib.sha256(f"{path}#{status.st_size}#{status.st_mtime_ns}#{variant}#{self._size}#{self._chunk}".encode()).hexdigest()
+        return self._root / digest
+    def _commit(self, temporary, meta):
+        '''
+        Completes a written entry, evicting least recently used entries to fit the size limit
+        '''
+        (temporary / "meta.json").write_text(json.dumps(meta))
+        directory = temporary.with_name(temporary.name.split(".")[0])
+        try:
+            os.rename(temporary, directory)
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True) # stored meanwhile by another stream
+        if not self._adopt(directory, meta):
+            return
+        with self._lock:
+            evicted = []
+            while self._total > self._limit and len(self._entries) > 1:
+                path, size = self._entries.popitem(last=False)
+                self._total -= size
+                evicted.append(path)
+        for path in evicted:
+            shutil.rmtree(path, ignore_errors=True)
+        for path in self._root.glob("*.tmp"):
+            # left by writers of exited processes
+            try:
+                os.kill(int(path.name.split(".")[1]), 0)
+            except ProcessLookupError:
+                shutil.rmtree(path, ignore_errors=True)
+            except (ValueError, IndexError, OSError):
+                pass
+    def _adopt(self, directory, meta):
+        '''
+        Indexes a complete entry if not indexed yet, marking it as most recently used
+        args:
+            directory: represents the entry directory
+            meta: represents the entry stored frames specifications
+        returns:
+            True if the entry is complete, False otherwise
+        '''
+        with self._lock:
+            if directory in self._entries:
+                self._entries.move_to_end(directory)
+                return True
+        try:
+            chunks = -(-int(meta["frame-count"]) // int(meta["chunk"]))
+            size = sum((directory / f"{chunk:06d}.npy").stat().st_size for chunk in range(chunks))
+        except (OSError, KeyError, TypeError, ValueError, ZeroDivisionError):
+            return False
+        with self._lock:
+            self._total += size - self._entries.pop(directory, 0)
+            self._entries[directory] = size
+        return True
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
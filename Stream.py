@@ -30,7 +30,13 @@ Copyright 2024 BaSSeM
 ## #### Import(s) ##############################################################
 ## #############################################################################
 
+from xstream import cv2
+from xstream import time
 from xstream import StringIO
+from xstream import _Pool
+from xstream import _Frame
+from xstream import _PyAV
+from xstream import _Paced
 
 ## #############################################################################
 ## #### Private Type(s) ########################################################
@@ -90,10 +96,33 @@ class _frames_generator:
 ## #### Private Variable(s) ####################################################
 ## #############################################################################
 
+_conversions = { # pixel format -> conversion of BGR frames
+    "bgr": None,
+    "rgb": lambda frame: cv2.cvtColor(frame, cv2.COLOR_BGR2RGB),
+    "gray": lambda frame: cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY),
+    "yuv": lambda frame: cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420),
+    "nv12": lambda frame: _nv12(frame),
+    }
+_raw_conversions = { # pixel format -> conversion code of raw YUYV frames
+    "rgb": cv2.COLOR_YUV2RGB_YUYV,
+    "gray": cv2.COLOR_YUV2GRAY_YUYV,
+    }
+
 ## #############################################################################
 ## #### Private Method(s) ######################################################
 ## #############################################################################
 
+def _nv12(frame):
+    '''
+    Converts a BGR frame into NV12, a full resolution Y plane followed by a half resolution interleaved U/V plane
+    '''
+    i420 = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+    height, width = frame.shape[:2]
+    nv12 = cv2.numpy.empty_like(i420)
+    nv12[:height] = i420[:height]
+    nv12[height:].reshape(height // 2, width // 2, 2)[...] = i420[height:].reshape(2, height // 2, width // 2).transpose(1, 2, 0)
+    return nv12
+
 ## #############################################################################
 ## #### Public Method(s) Prototype #############################################
 ## #############################################################################
@@ -119,6 +148,13 @@ class Stream:
         self._mode = None               # working mode, could be read, write, ...etc
         self._content = None            # content descriptor, handle for actual stream operations
         self._specifications = dict()   # specifications, could be any related specification ex: frame rate, number of frames, frame size, ...etc
+        self._pool = None               # pool from which the content descriptor is acquired, None if not pooled
+        self._key = None                # pool key of the content descriptor
+        self._conversion = None         # conversion of content descriptor frames into the negotiated pixel format, None if not needed
+        self._buffer = None             # reused buffer of content descriptor frames awaiting conversion
+        self._grabbed = None            # frame read by `grab` for content descriptors not splitting grabbing from decoding
+        self._records = False           # whether read frames are wrapped into `Frame` records
+        self._recorded = 0              # number of frames wrapped into `Frame` records
     def __len__(self):
         '''
         Gets the stream total number of frames
@@ -163,14 +199,16 @@ class Stream:
         returns:
             frames of specified indices
         '''
-        if not isinstance(key, (int, slice)):
+        if not isinstance(key, (int, cv2.numpy.integer, slice, list, tuple, cv2.numpy.ndarray)):
             raise RuntimeError(f"Not supported operation `__getitem__` for key `{key}` of type `{type(key)}` for stream source `{self._source}`")
         result = None
-        if isinstance(key, int):
-            self.seek(key)
+        if isinstance(key, (int, cv2.numpy.integer)):
+            self.seek(int(key))
             result = self.read()
         elif isinstance(key, slice):
             result = _frames_generator(self, key.start, key.stop, key.step)
+        else:
+            result = self.take(key)
         return result
     def __getattr__(self, name):
         '''
@@ -188,6 +226,35 @@ class Stream:
         if name in []:
             ... # TODO
         super().__setattr__(name, value)
+    def take(self, indices, stack=False, gap=8):
+        '''
+        Gets frames at many indices, visiting them in increasing order with the fewest seeks
+        args:
+            indices: represents the frames indices in any order, or a boolean mask over the stream frames
+            stack: represents whether to stack frames into one array (default = False)
+            gap: represents the maximum number of frames read through between two indices rather than seeking (default = 8)
+        returns:
+            list of frames ordered as the indices, or array of stacked frames
+        '''
+        indices = cv2.numpy.asarray(indices)
+        if indices.dtype == bool:
+            indices = cv2.numpy.flatnonzero(indices)
+        indices = [index + len(self) if index < 0 else index for index in indices.astype(int).tolist()]
+        frames = dict()
+        position = None # index of next frame to be read
+        for index in sorted(set(indices)):
+            if position is None or not 0 <= index - position <= gap:
+                self.seek(index)
+                position = index
+            while position < index:
+                self.grab() # frames read through are neither decoded where possible, nor converted
+                position += 1
+            frames[index] = self.read()
+            position += 1
+        result = [frames[index] for index in indices]
+        if stack:
+            return cv2.numpy.stack(result) if result else cv2.numpy.empty((0,), cv2.numpy.uint8)
+        return result
     def open(self, mode="r"):
         '''
         Opens the stream in specified mode
@@ -230,6 +297,27 @@ class Stream:
         '''
         raise RuntimeError(f"Not supported {self.__class__.__name__} operation `read` for stream source `{self._source}`")
         return None
+    def grab(self):
+        '''
+        Grabs the next frame of the stream, deferring its decoding and conversion to `retrieve` where possible
+        returns:
+            True on success, False otherwise
+        '''
+        if not (hasattr(self._content, "grab") and hasattr(self._content, "retrieve")):
+            # content descriptors not splitting grabbing from decoding read whole frames
+            self._grabbed = self.read()
+            return self._grabbed is not None
+        return self._content.grab()
+    def retrieve(self):
+        '''
+        Retrieves the last grabbed frame of the stream
+        returns:
+            a frame on success, None otherwise
+        '''
+        if not (hasattr(self._content, "grab") and hasattr(self._content, "retrieve")):
+            frame, self._grabbed = self._grabbed, None
+            return frame
+        return self._retrieve(grabbed=True)
     def write(self, frame):
         '''
         Writes a frame into the stream
@@ -240,6 +328,16 @@ class Stream:
         '''
         raise RuntimeError(f"Not supported {self.__class__.__name__} operation `write` for stream source `{self._source}`")
         return False
+    def write_many(self, frames):
+        '''
+        Writes many frames into the stream in order
+        args:
+            frames: represents an iterable of frames to be written into the stream
+        returns:
+            number of written frames
+        '''
+        raise RuntimeError(f"Not supported {self.__class__.__name__} operation `write_many` for stream source `{self._source}`")
+        return 0
     def get(self, property):
         '''
         Gets specified property value of the stream
@@ -261,6 +359,125 @@ class Stream:
         '''
         raise RuntimeError(f"Not supported {self.__class__.__name__} operation `set` for stream source `{self._source}`")
         return False
+    def keyframes(self):
+        '''
+        Decodes only the key frames of the stream, for fast coarse previews
+        returns:
+            generator of (frame index, timestamp in seconds, frame)
+        '''
+        raise RuntimeError(f"Not supported {self.__class__.__name__} operation `keyframes` for stream source `{self._source}`")
+        return None
+    def _scan(self, capture, specifications):
+        '''
+        Reads the key frames of a capture by seeking to each of them, so no other frame is decoded
+        args:
+            capture: represents the opened, seekable, capture
+            specifications: represents the probed specifications holding `key-frames`, one frame per second is read without them
+        returns:
+            generator of (frame index, timestamp in seconds, frame)
+        '''
+        specifications = specifications or dict()
+        rate = specifications.get("frame-rate") or capture.get(cv2.CAP_PROP_FPS) or 1.0
+        indices = specifications.get("key-frames")
+        if indices is None:
+            indices = range(0, int(specifications.get("frame-count") or capture.get(cv2.CAP_PROP_FRAME_COUNT)), max(1, round(rate)))
+        position = 0
+        for index in indices:
+            if index != position:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+            status, frame = capture.read()
+            if not status:
+                return
+            position = index + 1
+            yield index, index / rate, frame
+    def _negotiate(self, format, native=False, raw=False):
+        '''
+        Sets the pixel format of read frames, recording it as `pixel-format` specification
+        args:
+            format: represents the pixel format, one of 'bgr', 'rgb', 'gray', 'yuv' (I420), 'nv12'
+            native: represents whether the content descriptor already delivers frames in the pixel format (default = False)
+            raw: represents whether the content descriptor delivers raw YUYV frames rather than BGR ones (default = False)
+        '''
+        if not native and format not in _conversions:
+            raise ValueError(f"Not supported operation `open` for pixel format `{format}` for stream source `{self._source}`")
+        self._conversion = None if native else _conversions[format]
+        self._buffer = None
+        if raw:
+            code = _raw_conversions[format]
+            height, width = int(self._specifications["frame-height"]), int(self._specifications["frame-width"])
+            self._conversion = lambda frame: cv2.cvtColor(frame.reshape(height, width, 2), code)
+        self._specifications["pixel-format"] = format
+        if format not in ["bgr", "rgb"]:
+            self._specifications["frame-channels"] = 1 # single channel or planar frames
+    def _retrieve(self, grabbed=False):
+        '''
+        Reads a frame from the content descriptor, converted once into the negotiated pixel format
+        args:
+            grabbed: represents whether to retrieve the last grabbed frame rather than reading the next one (default = False)
+        returns:
+            a frame on success, None otherwise
+        '''
+        read = self._content.retrieve if grabbed else self._content.read
+        if self._conversion is None:
+            status, frame = read()
+            return self._record(frame) if status else None
+        if isinstance(self._content, cv2.VideoCapture):
+            # frames are decoded into the same buffer, only converted frames are handed out
+            status, frame = read(self._buffer)
+        else:
+            status, frame = read()
+        if not status:
+            return None
+        self._buffer = frame
+        return self._record(self._conversion(frame))
+    def _record(self, frame, index=None, timestamp=None):
+        '''
+        Wraps a read frame into a `Frame` record, if records are enabled
+        args:
+            frame: represents the read frame
+            index: represents the frame index (default = None: for the content descriptor position, or the number of read frames)
+            timestamp: represents the frame monotonic capture time (default = None: for now)
+        returns:
+            the record, or the frame itself if records are disabled
+        '''
+        if not self._records or frame is None:
+            return frame
+        self._recorded += 1
+        pts = None
+        if isinstance(self._content, _PyAV):
+            pts = self._content.get("frame-time")
+        elif isinstance(self._content, (cv2.VideoCapture, _Paced)):
+            pts = self._content.get(cv2.CAP_PROP_POS_MSEC) / 1000 # live-like paced frames are timed by the replay clock
+        if index is None and isinstance(self._content, (cv2.VideoCapture, _PyAV, _Paced)) and self._content.get(cv2.CAP_PROP_POS_FRAMES) > 0:
+            index = int(self._content.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+        return _Frame(frame, index if index is not None else self._recorded - 1, pts, timestamp if timestamp is not None else time.monotonic(), self._source)
+    def _acquire(self, factory, pool=None, **options):
+        '''
+        Acquires the content descriptor from a pool of warm descriptors, or creates it
+        args:
+            factory: represents a callable creating the content descriptor
+            pool: represents the pool to acquire from (default = None: for no pooling, True: for the shared pool)
+            options: represents the open parameters distinguishing descriptors of the same source
+        returns:
+            the content descriptor
+        '''
+        self._pool = _Pool.shared() if pool is True else pool or None
+        self._key = (self.__class__.__name__, str(self._source), tuple(sorted(options.items(), key=str)))
+        if self._pool is None:
+            return factory()
+        return self._pool.acquire(self._key, factory)
+    def _release(self, pooled=True):
+        '''
+        Releases the content descriptor back to its pool if any, or closes it
+        args:
+            pooled: represents whether the content descriptor may be kept warm by its pool (default = True)
+        '''
+        if self._pool is not None and pooled:
+            self._pool.release(self._key, self._content)
+        else:
+            self._content.release()
+        self._content = None
+        self._pool = None
 
 ## #############################################################################
 ## #### Public Method(s) #######################################################
@@ -0,0 +1,223 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Synthetic class is a live-like stream of generated frames, `synthetic://WxH@fps`
+sources, scrolling a pattern rendered once with the frame index embedded as
+binary cells and text, frames are written into new arrays, or optionally into
+a ring of preallocated buffers, and paced at the target frame rate, for load testing without cameras
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import cv2
+from xstream import urlsplit, parse_qs
+from xstream import _Paced
+from xstream import _Stream
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+class _generator:
+    '''
+    Generated frames reader, mimics the `cv2.VideoCapture` reading interface
+    '''
+    def __init__(self, width, height, fps, pattern="bars", buffers=0):
+        self._width = width
+        self._height = height
+        self._fps = fps
+        # pattern tiled twice so scrolling is a plain window copy
+        tile = _render(pattern, width, height)
+        self._pattern = cv2.numpy.concatenate([tile, tile], axis=1)
+        self._buffers = [cv2.numpy.empty((height, width, 3), dtype=cv2.numpy.uint8) for _ in range(buffers)]
+        self._cell = max(2, width // 64)    # size of an index bit cell
+        self._position = 0                  # index of next frame to be generated
+        self._opened = True
+    def isOpened(self):
+        return self._opened
+    def grab(self):
+        self._position += 1
+        return self._opened
+    def retrieve(self, image=None):
+        if not self._opened or self._position == 0:
+            return False, None
+        index = self._position - 1
+        if image is not None and image.shape == (self._height, self._width, 3):
+            frame = image
+        elif self._buffers:
+            frame = self._buffers[index % len(self._buffers)] # overwritten `buffers` frames later
+        else:
+            frame = cv2.numpy.empty((self._height, self._width, 3), dtype=cv2.numpy.uint8)
+        offset = (4 * index) % self._width
+        cv2.numpy.copyto(frame, self._pattern[:, offset:offset + self._width])
+        # 32 index bits, most significant first, white for set
+        cells = frame[:self._cell, :32 * self._cell].reshape(self._cell, 32, self._cell, 3)
+        cells[:] = ((index >> cv2.numpy.arange(31, -1, -1)) & 1).astype(cv2.numpy.uint8)[None, :, None, None] * 255
+        cv2.putText(frame, f"{index}", (self._cell, self._height - self._cell), cv2.FONT_HERSHEY_SIMPLEX, max(0.4, self._height / 480), (255, 255, 255), max(1, self._height // 240))
+        return True, frame
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+    def get(self, property):
+        return {
+            cv2.CAP_PROP_FPS: self._fps,
+            cv2.CAP_PROP_FRAME_COUNT: -1,
+            cv2.CAP_PROP_FRAME_WIDTH: self._width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self._height,
+            cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS: 3,
+            cv2.CAP_PROP_POS_FRAMES: self._position,
+            }.get(property, 0)
+    def set(self, property, value):
+        return False
+    def release(self):
+        self._opened = False
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+_patterns = ["bars", "gradient", "checker", "noise"]
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+def _render(pattern, width, height):
+    '''
+    Renders a pattern frame
+    args:
+        pattern: represents the pattern, one of 'bars': for vertical color bars, 'gradient': for an horizontal hue ramp, 'checker': for a checkerboard, 'noise': for reproducible uniform noise
+        width: represents the frame width
+        height: represents the frame height
+    returns:
+        the BGR frame
+    '''
+    if pattern in ["bars"]:
+        colors = cv2.numpy.array([[192, 192, 192], [0, 192, 192], [192, 192, 0], [0, 192, 0], [192, 0, 192], [0, 0, 192], [192, 0, 0], [16, 16, 16]], dtype=cv2.numpy.uint8)
+        columns = colors[cv2.numpy.arange(width) * len(colors) // width]
+        return cv2.numpy.ascontiguousarray(cv2.numpy.broadcast_to(columns, (height, width, 3)))
+    if pattern in ["gradient"]:
+        hsv = cv2.numpy.empty((height, width, 3), dtype=cv2.numpy.uint8)
+        hsv[..., 0] = (cv2.numpy.arange(width) * 180 // width)[None, :]
+        hsv[..., 1] = 255
+        hsv[..., 2] = (255 - cv2.numpy.arange(height) * 192 // height)[:, None]
+        return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+    if pattern in ["checker"]:
+        size = max(1, min(width, height) // 8)
+        board = ((cv2.numpy.arange(height)[:, None] // size + cv2.numpy.arange(width)[None, :] // size) % 2).astype(cv2.numpy.uint8) * 255
+        return cv2.cvtColor(board, cv2.COLOR_GRAY2BGR)
+    return cv2.numpy.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=cv2.numpy.uint8)
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class Synthetic(_Stream):
+    def __init__(self, source):
+        super().__init__(source)
+        if not isinstance(self._source, (str,)):
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source-type `{type(self._source)}`")
+        parts = urlsplit(self._source)
+        size, _, fps = parts.netloc.partition("@")
+        try:
+            width, height = (int(value) for value in size.lower().split("x"))
+            fps = float(fps or 30)
+        except ValueError:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source `{self._source}`, expected `synthetic://WxH@fps`")
+        if width < 64 or height < 16:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source `{self._source}` with size `{width}x{height}`, expected at least `64x16` to embed the frame index")
+        pattern = parse_qs(parts.query).get("pattern", ["bars"])[0]
+        if pattern not in _patterns:
+            raise RuntimeError(f"Not supported {self.__class__.__name__} source `{self._source}` with pattern `{pattern}`")
+        self._type = "Synthetic"
+        self._pattern = pattern
+        self._specifications["frame-rate"] = fps
+        self._specifications["frame-width"] = width
+        self._specifications["frame-height"] = height
+        self._specifications["frame-channels"] = 3
+    def __len__(self):
+        return cv2.numpy.inf
+    def open(self, mode="r", pool=None, format="bgr", speed=1.0, buffers=0):
+        if mode not in ["r"]:
+            raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        self._mode = mode
+        width, height, fps = self._specifications["frame-width"], self._specifications["frame-height"], self._specifications["frame-rate"]
+        # generating is paced like a live source, late readers skip frames
+        self._content = self._acquire(lambda: _Paced(_generator(width, height, fps, self._pattern, buffers), speed=speed), pool, speed=speed, buffers=buffers)
+        self._negotiate(format)
+        return self._content.isOpened()
+    def close(self):
+        self._release()
+        return True
+    def tell(self):
+        return int(self._content.get(cv2.CAP_PROP_POS_FRAMES))
+    def seek(self, index):
+        return False
+    def read(self):
+        if self._mode not in ["r"]:
+            raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
+        return self._retrieve()
+    def get(self, property):
+        if property in self._specifications:
+            return self._specifications[property]
+        return self._content.get(property)
+    def write(self):
+        if self._mode not in []:
+            raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
+        return False
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
@@ -0,0 +1,244 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Tee class decodes each frame of a stream once and shares it by reference among
+many independent thread-safe readers, each reader has its own position within
+a bounded window of buffered frames
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+from xstream import deque
+from xstream import Condition
+from xstream import _Governor
+from xstream import _Stream
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+class TeeReader(_Stream):
+    def __init__(self, source, reader):
+        super().__init__(source)
+        self._type = "Tee"
+        self._reader = reader   # reader index within the tee
+        self._index = None      # index of last read frame
+        self.dropped = 0        # number of frames skipped for lagging behind the other readers
+    def __len__(self):
+        return len(self._source._stream)
+    def open(self, mode="r"):
+        if mode not in ["r"]:
+            raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        self._mode = mode
+        return True
+    def close(self):
+        self._source._detach(self._reader)
+        return True
+    def tell(self):
+        return self._index
+    def seek(self, index):
+        return False
+    def read(self):
+        if self._mode not in ["r"]:
+            raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
+        return self._source._read(self)
+    def write(self):
+        if self._mode not in []:
+            raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
+        return False
+
+class Tee:
+    '''
+    Single decoding, many readers stream splitter
+    '''
+    def __init__(self, stream, count=2, lag=8, policy="block", governor=None):
+        '''
+        Initializes the splitter
+        args:
+            stream: represents the opened stream from which to decode frames
+            count: represents the number of readers (default = 2)
+            lag: represents the maximum number of frames a reader may lag behind the fastest reader (default = 8)
+            policy: represents what happens once `lag` is exceeded (default = 'block': for fastest reader waiting, 'drop': for lagging reader skipping frames)
+            governor: represents the memory governor accounting the buffered frames (default = None: for the shared governor)
+        returns:
+            a splitter instance, its readers are in `readers`
+        '''
+        if policy not in ["block", "drop"]:
+            raise ValueError(f"Not supported {self.__class__.__name__} policy `{policy}` for stream source `{stream}`")
+        self._stream = stream
+        self._lag = max(1, lag)
+        self._policy = policy
+        self._condition = Condition()
+        self._buffer = deque()              # frames not yet read by all readers
+        self._first = 0                     # index of first buffered frame
+        self._next = 0                      # index of next frame to be decoded
+        self._positions = [0] * count       # per reader index of next frame to be read, None once closed
+        self._decoding = False
+        self._ended = False
+        self._governor = governor if governor is not None else _Governor.shared()
+        self._owner = str(getattr(stream, "_stream", stream)._source) # governed source
+        self.readers = tuple(TeeReader(self, reader) for reader in range(count))
+        for reader in self.readers:
+            reader.open()
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._stream.__class__.__name__}, readers={len(self.readers)})"
+    def close(self):
+        '''
+        Closes all readers and the source stream
+        returns:
+            True on a successful closing, False otherwise
+        '''
+        for reader in self.readers:
+            reader.close()
+        with self._condition:
+            while self._buffer:
+                self._drop()
+        return self._stream.close()
+    def _read(self, reader):
+        '''
+        Reads the next frame of a reader, decoding it if no reader did yet
+        args:
+            reader: represents the reader handle
+        returns:
+            a frame on success, None otherwise
+        '''
+        with self._condition:
+            while True:
+                position = self._positions[reader._reader]
+                if position is None:
+                    return None
+                if position < self._first:
+                    reader.dropped += self._first - position
+                    position = self._positions[reader._reader] = self._first
+                if position < self._next:
+                    frame = self._buffer[position - self._first]
+                    self._positions[reader._reader] = position + 1
+                    reader._index = position
+                    self._trim()
+                    return frame
+                if self._ended:
+                    return None
+                if self._decoding or (self._policy in ["block"] and self._next - self._slowest() >= self._lag):
+                    self._condition.wait()
+                    continue
+                self._decoding = True
+                self._condition.release()
+                try:
+                    frame = self._stream.read()
+                    # a dropping tee never waits for memory held by lagging readers, it makes room instead
+                    frame, charged = self._governor.admit(self._owner, frame, timeout=0 if self._policy in ["drop"] else None) if frame is not None else (None, False)
+                finally:
+                    self._condition.acquire()
+                    self._decoding = False
+                    self._condition.notify_all()
+                if frame is None:
+                    self._ended = True
+                    continue
+                if not charged:
+                    # the oldest buffered frames make room for the new one, lagging readers skip them
+                    while self._buffer and not self._governor.charge(self._owner, frame.nbytes):
+                        self._drop()
+                    if not self._buffer:
+                        self._governor.charge(self._owner, frame.nbytes, force=True)
+                self._buffer.append(frame)
+                self._next += 1
+                if len(self._buffer) > self._lag:
+                    # only reachable by `drop` policy, lagging readers skip the oldest frame
+                    self._drop()
+    def _drop(self):
+        '''
+        Drops the oldest buffered frame, caller MUST hold the condition
+        '''
+        frame = self._buffer.popleft()
+        self._first += 1
+        self._governor.release(self._owner, frame.nbytes)
+    def _detach(self, reader):
+        '''
+        Detaches a closed reader so it no longer holds frames buffered
+        '''
+        with self._condition:
+            self._positions[reader] = None
+            self._trim()
+    def _slowest(self):
+        '''
+        Gets the index of next frame to be read by the slowest reader, caller MUST hold the condition
+        '''
+        return min((position for position in self._positions if position is not None), default=self._next)
+    def _trim(self):
+        '''
+        Drops frames read by all readers, caller MUST hold the condition
+        '''
+        slowest = self._slowest()
+        trimmed = False
+        while self._buffer and self._first < slowest:
+            self._drop()
+            trimmed = True
+        if trimmed:
+            self._condition.notify_all()
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    ...
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################
\ No newline at end of file
@@ -30,8 +30,14 @@ Copyright 2024 BaSSeM
 ## #### Import(s) ##############################################################
 ## #############################################################################
 
+from xstream import av
 from xstream import cv2
 from xstream import Path
+from xstream import _Probe
+from xstream import _Store
+from xstream import _FFmpeg
+from xstream import _PyAV
+from xstream import _Paced
 from xstream import _Stream
 
 ## #############################################################################
@@ -73,18 +79,61 @@ class Video(_Stream):
         self._specifications["frame-height"] = None
         self._specifications["frame-channels"] = None
     def __len__(self):
+        if isinstance(self._content, _Paced):
+            return cv2.numpy.inf
+        if self._specifications["frame-count"] is not None:
+            return int(self._specifications["frame-count"])
         return int(self._content.get(cv2.CAP_PROP_FRAME_COUNT))
-    def open(self, mode="r"):
+    def open(self, mode="r", pool=None, backend="opencv", format="bgr", codec="libx264", preset="veryfast", crf=23, threads=0, store=None, pace=None):
         if mode not in ["r", "w"]:
             raise ValueError(f"Not supported operation `open` for mode `{mode}` for stream source `{self._source}`")
+        if backend not in {"r": ["opencv", "av"], "w": ["opencv", "ffmpeg"]}[mode]:
+            raise ValueError(f"Not supported operation `open` for backend `{backend}` in mode `{mode}` for stream source `{self._source}`")
         self._mode = mode
+        for property in ["frames-written", "bytes-piped", "bytes-written", "write-rate"]:
+            self._specifications.pop(property, None) # previous writing session statistics
+        store = _Store.shared() if store is True else store or None
+        variant = format if backend in ["av"] else "bgr" # pixel format of the content descriptor frames
+        reader = store.reader(self._source, variant) if store is not None and self._mode in ["r"] else None
+        if store is not None or pace is not None:
+            pool = None # storing and paced captures are not kept warm
+        if self._mode in ["r"] and reader is not None:
+            # stored frames are served as memory-mapped views, without decoding
+            self._content = reader
+        elif self._mode in ["r"] and backend in ["av"]:
+            # frames are decoded directly into the requested pixel format
+            self._content = self._acquire(lambda: _PyAV(self._source, format=format, threads=threads), pool, backend=backend, format=format, threads=threads)
+        elif self._mode in ["r"]:
+            self._content = self._acquire(lambda: cv2.VideoCapture(str(self._source)), pool)
         if self._mode in ["r"]:
-            self._content = cv2.VideoCapture(str(self._source))
+            if self._pool is not None:
+                self.seek(0) # warm capture may be positioned anywhere
             self._specifications["frame-rate"] = self._content.get(cv2.CAP_PROP_FPS)
             self._specifications["frame-count"] = self._content.get(cv2.CAP_PROP_FRAME_COUNT)
             self._specifications["frame-width"] = self._content.get(cv2.CAP_PROP_FRAME_WIDTH)
             self._specifications["frame-height"] = self._content.get(cv2.CAP_PROP_FRAME_HEIGHT)
             self._specifications["frame-channels"] = self._content.get(cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS)
+            # container headers are exact, unlike the decoder estimated frame count, frames size is kept from the decoder as it applies rotation
+            specifications = _Probe.shared().probe(self._source)
+            if specifications is not None:
+                self._specifications.update({property: specifications[property] for property in ["frame-rate", "frame-count"]})
+            if backend in ["av"]:
+                self._specifications["frame-channels"] = self._content.get(cv2.CAP_PROP_VIDEO_TOTAL_CHANNELS) # decoded pixel format
+            if store is not None:
+                if reader is None:
+                    # a first sequential pass over all frames fills the store
+                    self._content = store.writer(self._source, self._content, self._specifications["frame-count"], variant)
+                self._specifications["frame-width"] = self._content.get(cv2.CAP_PROP_FRAME_WIDTH) # stored frames may be downscaled
+                self._specifications["frame-height"] = self._content.get(cv2.CAP_PROP_FRAME_HEIGHT)
+            if pace is not None:
+                # replayed like a live source, looping, at `pace` times real time
+                self._content = _Paced(self._content, speed=pace)
+                self._specifications["frame-rate"] = self._content.get(cv2.CAP_PROP_FPS)
+                self._specifications["frame-count"] = None
+            self._negotiate(format, native=backend in ["av"])
+        elif self._mode in ["w"] and backend in ["ffmpeg"]:
+            # frame size is learnt from the first written frame
+            self._content = _FFmpeg(self._source, fps=self._specifications["frame-rate"], codec=codec, preset=preset, crf=crf, threads=threads)
         elif self._mode in ["w"]:
             # TODO Handle un-set required specifications
             self._content = cv2.VideoWriter(
@@ -95,24 +144,55 @@ class Video(_Stream):
                                            )
         return self._content.isOpened()
     def close(self):
-        self._content.release()
-        self._content = None
+        content = self._content
+        self._release(pooled=self._mode in ["r"])
+        if isinstance(content, _FFmpeg):
+            # encoding statistics remain available once the output video is finalized
+            self._specifications.update({property: content.get(property) for property in ["frames-written", "bytes-piped", "bytes-written", "write-rate"]})
     def tell(self):
         return int(self._content.get(cv2.CAP_PROP_POS_FRAMES))
     def seek(self, index):
+        if isinstance(self._content, _Paced):
+            return False
         return self._content.set(cv2.CAP_PROP_POS_FRAMES, index)
     def read(self):
         if self._mode not in ["r"]:
             raise RuntimeError(f"Not supported operation `read` for mode `{self._mode}` for stream source `{self._source}`")
-        status, frame = self._content.read()
-        if not status:
-            frame = None
-        return frame
+        return self._retrieve()
     def write(self, frame):
         if self._mode not in ["w"]:
             raise RuntimeError(f"Not supported operation `write` for mode `{self._mode}` for stream source `{self._source}`")
         self._content.write(frame)
         return frame
+    def write_many(self, frames):
+        if self._mode not in ["w"]:
+            raise RuntimeError(f"Not supported operation `write_many` for mode `{self._mode}` for stream source `{self._source}`")
+        if isinstance(self._content, _FFmpeg):
+            return self._content.write_many(frames)
+        count = 0
+        for frame in frames:
+            self._content.write(frame)
+            count += 1
+        return count
+    def keyframes(self):
+        if av is not None:
+            # the decoder discards non key packets while demuxing sequentially
+            reader = _PyAV(self._source)
+            if reader.isOpened():
+                try:
+                    yield from reader.keyframes()
+                finally:
+                    reader.release()
+                return
+        capture = cv2.VideoCapture(str(self._source))
+        try:
+            yield from self._scan(capture, _Probe.shared().probe(self._source, keyframes=True))
+        finally:
+            capture.release()
+    def get(self, property):
+        if property in self._specifications:
+            return self._specifications[property]
+        return self._content.get(property)
 
 ## #############################################################################
 ## #### Public Method(s) #######################################################
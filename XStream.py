@@ -34,7 +34,11 @@ X-Stream class wraps various stream sources into unified interface
 ## #### Import(s) ##############################################################
 ## #############################################################################
 
+from xstream import re
+from xstream import inspect
+from xstream import glob
 from xstream import Path
+from xstream import ThreadPoolExecutor
 
 from xstream import _Stream
 from xstream import _Camera
@@ -43,6 +47,16 @@ from xstream import _HTTP
 from xstream import _HTTPS
 from xstream import _Image
 from xstream import _Video
+from xstream import _Playlist
+from xstream import _Sequence
+from xstream import _Synthetic
+from xstream import _Shared
+from xstream import _Publisher
+from xstream import _Tee
+from xstream import _Map
+from xstream import _Server
+from xstream import _Adaptive
+from xstream import _Probe
 
 ## #############################################################################
 ## #### Private Type(s) ########################################################
@@ -75,10 +89,18 @@ class XStream:
             self._stream = _Camera(source)
         elif isinstance(source, str) and source.find(f"rtsp://", 0, len(f"rtsp://")) != -1:
             self._stream = _RTSP(source)
+        elif isinstance(source, str) and source.find(f"shm://", 0, len(f"shm://")) != -1:
+            self._stream = _Shared(source)
         elif isinstance(source, str) and source.find(f"http://", 0, len(f"http://")) != -1:
             self._stream = _HTTP(source)
         elif isinstance(source, str) and source.find(f"https://", 0, len(f"https://")) != -1:
             self._stream = _HTTPS(source)
+        elif isinstance(source, str) and source.find(f"synthetic://", 0, len(f"synthetic://")) != -1:
+            self._stream = _Synthetic(source)
+        elif isinstance(source, (str, Path)) and not Path(source).exists() and re.search(r"%0?\d*d", Path(source).name):
+            self._stream = _Sequence(source)
+        elif isinstance(source, (list, tuple)) or (isinstance(source, (str, Path)) and not Path(source).exists() and glob.has_magic(str(source))):
+            self._stream = _Playlist(source)
         elif isinstance(source, (str, Path)):
             extension = Path(source).suffix[1:].lower()
             if extension in ["jpg", "jpeg", "jpe", "bmp", "png", "pbm", "pgm", "ppm", "pxm", "pnm"]:
@@ -95,8 +117,10 @@ class XStream:
         return self._stream.__getitem__(i)
     def __repr__(self):
         return self._stream.__repr__()
-    def open(self, mode="r"):
-        return self._stream.open(mode)
+    def open(self, mode="r", frames=False, **options):
+        # read frames are wrapped into `Frame` records only on demand, raw arrays are kept otherwise
+        self._stream._records = frames
+        return self._stream.open(mode, **options)
     def close(self):
         return self._stream.close()
     def tell(self):
@@ -105,8 +129,55 @@ class XStream:
         return self._stream.seek(index)
     def read(self):
         return self._stream.read()
+    def grab(self):
+        return self._stream.grab()
+    def retrieve(self):
+        return self._stream.retrieve()
     def write(self, frame):
         return self._stream.write(frame)
+    def write_many(self, frames):
+        return self._stream.write_many(frames)
+    def get(self, property):
+        return self._stream.get(property)
+    def set(self, property, value):
+        return self._stream.set(property, value)
+    def take(self, indices, stack=False, gap=8):
+        return self._stream.take(indices, stack, gap)
+    def keyframes(self, **options):
+        return self._stream.keyframes(**options)
+    def publish(self, name, slots=8):
+        return _Publisher(self, name, slots).start()
+    def serve(self, port=8080, host="127.0.0.1", quality=80, buffer=1<<18, governor=None):
+        return _Server(self, host, port, quality, buffer, governor).start()
+    def adapt(self, latency=0.2, steps=None, hold=1.0, headroom=0.5, callback=None):
+        return _Adaptive(self, latency, steps, hold, headroom, callback)
+    def map(self, function, workers=4, backend="thread", ordered=True, inflight=None, governor=None):
+        return _Map(self, function, workers, backend, ordered, inflight, governor=governor)
+    def tee(self, count=2, lag=8, policy="block", governor=None):
+        return _Tee(self, count, lag, policy, governor).readers
+    @staticmethod
+    def open_many(sources, mode="r", workers=32, **options):
+        streams = [XStream(source) for source in sources]
+        def open(stream):
+            # options not supported by a stream type, ex: `pool` for images, are left out
+            parameters = inspect.signature(stream._stream.open).parameters
+            if not any(parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in parameters.values()):
+                selected = {name: value for name, value in options.items() if name in parameters or name in ["frames"]}
+            else:
+                selected = options
+            try:
+                return stream.open(mode, **selected)
+            except Exception:
+                return False # a failing source does not fail the others
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(streams)))) as executor:
+            statuses = list(executor.map(open, streams))
+        return streams, statuses
+    @staticmethod
+    def probe(source, keyframes=False):
+        return _Probe.shared().probe(source, keyframes)
+    @staticmethod
+    def probe_many(sources, workers=None, keyframes=False):
+        return _Probe.shared().probe_many(sources, workers, keyframes)
 
 ## #############################################################################
 ## #### Public Method(s) #######################################################
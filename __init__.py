@@ -30,12 +30,57 @@ Copyright 2024 BaSSeM
 ## #### Import(s) ##############################################################
 ## #############################################################################
 
+import io
+import re
+import inspect
+import os
+import glob
+import json
+import random
+import time
+import struct
+import hashlib
+import socket
+import shutil
+import tempfile
+import subprocess
+import http.client
+import asyncio
 import cv2
 import pafy
 
+try:
+    import av
+except ImportError:
+    av = None # optional, only required by `PyAV` reading backend
+
+try:
+    import turbojpeg
+except ImportError:
+    turbojpeg = None # optional, only required by `JPEG` accelerated decoding
+
 from io import StringIO
+from bisect import bisect_right
 from pathlib import Path
-
+from threading import Thread, Lock, Condition, Event, Timer
+from collections import deque, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory, resource_tracker
+from urllib.parse import urlsplit, parse_qs
+
+from .Resolver import Resolver as _Resolver
+from .Frame import Frame as _Frame
+from .Governor import Governor as _Governor
+from .JPEG import JPEG as _JPEG
+from .MJPEG import MJPEG as _MJPEG
+from .ChunkCache import ChunkCache as _ChunkCache
+from .RangeReader import RangeReader as _RangeReader
+from .Pool import Pool as _Pool
+from .Probe import Probe as _Probe
+from .Store import Store as _Store
+from .FFmpeg import FFmpeg as _FFmpeg
+from .PyAV import PyAV as _PyAV
+from .Paced import Paced as _Paced
 from .Stream import Stream as _Stream
 from .Camera import Camera as _Camera
 from .RTSP import RTSP as _RTSP
@@ -43,8 +88,26 @@ from .HTTP import HTTP as _HTTP
 from .HTTPS import HTTPS as _HTTPS
 from .Image import Image as _Image
 from .Video import Video as _Video
+from .Playlist import Playlist as _Playlist
+from .Sequence import Sequence as _Sequence
+from .Synthetic import Synthetic as _Synthetic
+from .Shared import Shared as _Shared, Publisher as _Publisher
+from .Tee import Tee as _Tee
+from .Map import Map as _Map
+from .Server import Server as _Server
+from .Adaptive import Adaptive as _Adaptive
 
 from .XStream import XStream
+from .Resolver import Resolver
+from .ChunkCache import ChunkCache
+from .Pool import Pool
+from .Frame import Frame
+from .Governor import Governor
+from .Probe import Probe
+from .Store import Store
+from .JPEG import JPEG
+from .Dataset import Dataset
+from .Group import Group
 
 ## #############################################################################
 ## #### Private Type(s) ########################################################
@@ -0,0 +1,116 @@
+## #############################################################################
+## #### Copyright ##############################################################
+## #############################################################################
+
+'''
+Copyright 2024 BaSSeM
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+'''
+
+## #############################################################################
+## #### Description ############################################################
+## #############################################################################
+
+'''
+Benchmarks JPEG decoding, full size decoding then resizing against scaled
+decoding, with OpenCV and with TurboJPEG if installed
+'''
+
+## #############################################################################
+## #### Control Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Import(s) ##############################################################
+## #############################################################################
+
+import cv2
+from time import perf_counter
+
+from xstream import JPEG
+
+## #############################################################################
+## #### Private Type(s) ########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) Prototype ############################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Variable(s) ####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Private Method(s) ######################################################
+## #############################################################################
+
+def _benchmark(decode, payload, repeat):
+    """
+    Measure the decoded frames per second of `decode` over `payload`, returning the rate and the decoded frame shape
+    """
+    frame = decode(payload) # warm up
+    start = perf_counter()
+    for _ in range(repeat):
+        decode(payload)
+    return repeat / (perf_counter() - start), frame.shape
+
+## #############################################################################
+## #### Public Method(s) Prototype #############################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Type(s) #########################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Method(s) #######################################################
+## #############################################################################
+
+## #############################################################################
+## #### Public Variable(s) #####################################################
+## #############################################################################
+
+## #############################################################################
+## #### Main ###################################################################
+## #############################################################################
+
+if __name__ == "__main__":
+    print(f"JPEG decoding benchmark started")
+    
+    # Full HD payload, as received from cameras
+    image = cv2.resize(cv2.imread("sample.jpg"), (1920, 1080), interpolation=cv2.INTER_CUBIC)
+    payload = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+    repeat = 100
+    
+    backends = ["opencv"] + (["turbojpeg"] if JPEG().backend == "turbojpeg" else [])
+    if len(backends) == 1:
+        print(f"TurboJPEG is not installed, only OpenCV is benchmarked")
+    for scale in [1, 2, 4, 8]:
+        if scale > 1:
+            # baseline, full size decoding then resizing
+            full = JPEG(1, "opencv")
+            rate, shape = _benchmark(lambda payload: cv2.resize(full.decode(payload), (1920 // scale, 1080 // scale), interpolation=cv2.INTER_AREA), payload, repeat)
+            print(f"1/{scale} opencv    decode+resize       {rate:8.1f} fps {shape}")
+        for backend in backends:
+            for buffers in ([0, 2] if backend == "turbojpeg" else [0]):
+                decoder = JPEG(scale, backend, buffers)
+                rate, shape = _benchmark(decoder.decode, payload, repeat)
+                print(f"1/{scale} {backend:9} scaled, buffers={buffers}  {rate:8.1f} fps {shape}")
+    
+    print(f"JPEG decoding benchmark finished")
+
+## #############################################################################
+## #### END OF FILE ############################################################
+## #############################################################################